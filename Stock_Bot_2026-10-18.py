@@ -0,0 +1,26 @@
+from stock_bot.pipeline import tangency, risk_free
+from stock_bot.data import load_stocks, accepted
+from stock_bot.align import aligned_stocks
+from stock_bot.pairs import scan_pairs
+from stock_bot.universe import tickers
+from stock_bot.trace import Run
+from stock_bot import plot
+import json
+
+# The -07-13 pair report and the -08-10 tangency portfolio on top of the
+# stock_bot library; nothing runs on import
+
+def pairs(tickers, k=100):
+    stocks = accepted(load_stocks(tickers))
+    _, prices, _ = aligned_stocks(stocks, 180)
+    return scan_pairs(prices, [stock.ticker for stock in stocks], k)
+
+if __name__ == '__main__':
+    for pair in pairs(tickers):
+        print(pair)
+
+    run = Run()
+    names, portfolio, portfolio_risk, portfolio_return, markowitz_risk, markowitz_return, returns, cov_matrix = tangency(tickers, run=run)
+    print(json.dumps(run.summary(), indent=1))
+    print(dict(zip(names, portfolio.round(4))))
+    plot.frontier(markowitz_risk, markowitz_return, portfolio_risk, portfolio_return, risk_free)
@@ -0,0 +1,49 @@
+# The pieces of the Stock_Bot scripts as a library:
+#   pairs, align, rolling        pairwise math on price histories (numpy only)
+#   data, store, metadata        fetching and keeping prices and ticker info
+#   schedule                     rate limits and retries in front of a backend
+#   batch                        many histories per request, split without pandas
+#   screen                       cheap rejections before the history download
+#   refresh                      resumable, sharded refresh of the price store
+#   portfolio, estimators        efficient frontier, covariance estimators
+#   pipeline                     tangency() from a ticker list to a portfolio
+#   backtest                     the z-score pair rule replayed over history
+#   monitor                      live z-scores of a set of pairs from a price feed
+#   sweep                        the scripts' parameters evaluated as a grid
+#   plot                         matplotlib helpers
+# Names below are imported on first use, so `from stock_bot import tangency`
+# loads numpy and nothing else; scipy, yfinance and matplotlib wait until used.
+
+_exports = {
+    'covariance': 'pairs', 'correlation': 'pairs', 'z_score': 'pairs', 'z_score_info': 'pairs',
+    'cov_corr_matrices': 'pairs', 'cov_corr_aligned': 'pairs', 'z_score_info_matrices': 'pairs',
+    'z_info_condensed': 'pairs', 'ZInfo': 'pairs', 'scan_pairs': 'pairs',
+    'aligned_prices': 'align', 'aligned_stocks': 'align',
+    'RollingCovariance': 'rolling',
+    'Stock': 'data', 'load_stocks': 'data', 'FakeBackend': 'data', 'YFinanceBackend': 'data',
+    'Scheduler': 'schedule',
+    'Screen': 'screen',
+    'PriceStore': 'store', 'RefreshJob': 'refresh',
+    'download': 'batch', 'FixtureBackend': 'batch',
+    'InfoCache': 'metadata',
+    'Frontier': 'portfolio', 'BlockSolver': 'portfolio', 'hrp': 'portfolio',
+    'ConstrainedFrontier': 'portfolio',
+    'ledoit_wolf': 'estimators', 'FactorModel': 'estimators',
+    'pair_matrices': 'parallel',
+    'backtest_pairs': 'backtest', 'backtest_windows': 'backtest', 'qualifying_pairs': 'backtest',
+    'sweep_grid': 'sweep',
+    'PairMonitor': 'monitor', 'ReplayFeed': 'monitor',
+    'tangency': 'pipeline', 'refresh_tangency': 'pipeline',
+    'Run': 'trace',
+}
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    import importlib
+    value = getattr(importlib.import_module(f'.{_exports[name]}', __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted([*globals(), *_exports])
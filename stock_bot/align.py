@@ -0,0 +1,34 @@
+import numpy as np
+
+def aligned_prices(series, days=180, fill=True):
+    # joins (dates, closes) series on the union of their trading dates and keeps
+    # the last `days` of them. Returns the dates, a C-contiguous (days x N)
+    # price matrix and a mask of the observed prices. With fill, a missing
+    # session repeats the previous close (a zero return) instead of shifting
+    # the series; days before a ticker's first close stay NaN
+    dates = [np.asarray(d, dtype='datetime64[D]') for d, _ in series]
+    index, positions = np.unique(np.concatenate(dates), return_inverse=True)
+    cut = max(len(index)-days, 0)
+    index = index[cut:]
+
+    prices = np.full((len(index), len(series)), np.nan)
+    start = 0
+    for column, (d, (_, closes)) in enumerate(zip(dates, series)):
+        rows = positions[start:start+len(d)]-cut
+        start += len(d)
+        keep = rows >= 0
+        prices[rows[keep], column] = np.asarray(closes, dtype=float)[keep]
+    valid = ~np.isnan(prices)
+
+    if fill:
+        # forward fill: take each cell's last observed row
+        last = np.where(valid, np.arange(len(index))[:,None], 0)
+        np.maximum.accumulate(last, axis=0, out=last)
+        filled = prices[last, np.arange(len(series))]
+        # rows before the first observation point at row 0, which may be NaN or a later price
+        seen = np.maximum.accumulate(valid, axis=0)
+        prices = np.where(seen, filled, np.nan)
+    return index, np.ascontiguousarray(prices), valid
+
+def aligned_stocks(stocks, days=180, fill=True):
+    return aligned_prices([(stock.dates, stock.history) for stock in stocks], days, fill)
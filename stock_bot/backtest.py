@@ -0,0 +1,108 @@
+from .pairs import cov_corr_aligned
+from .align import aligned_prices
+import numpy as np
+
+# Replays the z_score() pair rule over the whole stored history:
+#   z > entry:  sell stock1, buy stock2     z < -entry:  buy stock1, sell stock2
+# and closes when |z| falls to exit or after max_hold bars. All pairs move
+# through time together, so the only Python loop is over bars
+
+def store_prices(store, tickers, days=100000):
+    return aligned_prices([(store.dates(ticker), store.closes(ticker)) for ticker in tickers], days)
+
+def qualifying_pairs(prices, min_corr=0.7):
+    # the (i, j) columns, i < j, that scan_pairs() would consider
+    _, corr_matrix = cov_corr_aligned(prices)
+    i, j = np.triu_indices(prices.shape[1], 1)
+    keep = np.abs(corr_matrix[i, j]) > min_corr
+    return np.column_stack([i[keep], j[keep]])
+
+def rolling_z(ratio, window):
+    # z_score() at every bar: the bar against the mean/std of the `window` bars
+    # before it, from cumulative sums. ratio is (pairs x T); z is NaN until a
+    # pair has `window` prices behind it. Centering first keeps the sums small
+    missing = np.isnan(ratio)
+    centered = np.where(missing, 0, ratio - np.nanmean(ratio, axis=1, keepdims=True))
+    c0, c1, c2 = (np.zeros((len(ratio), ratio.shape[1]+1)) for _ in range(3))
+    np.cumsum(missing, axis=1, out=c0[:,1:])
+    np.cumsum(centered, axis=1, out=c1[:,1:])
+    np.cumsum(centered**2, axis=1, out=c2[:,1:])
+    mean = (c1[:,window:-1] - c1[:,:-window-1])/window
+    var = (c2[:,window:-1] - c2[:,:-window-1])/window - mean**2
+    std = np.sqrt(np.maximum(var, 0))
+    gaps = (c0[:,window+1:] - c0[:,:-window-1]) > 0  # window or current bar missing
+    z = np.full(ratio.shape, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z[:,window:] = np.where(gaps, np.nan, np.where(std > 0, (centered[:,window:] - mean)/std, 0))
+    return z
+
+def predicted_horizon(z, t, rows, horizon=14, exit=0.5):
+    # z_score_info()'s n at bar t: bars back to the last |z| <= exit, 1 if none
+    lags = np.abs(z[rows][:, t-np.arange(1, horizon+1)]) <= exit
+    return np.where(lags.any(axis=1), np.argmax(lags, axis=1)+1, 1)
+
+def backtest_pairs(prices, pairs, window=50, entry=2, exit=0.5, max_hold=14, horizon=14):
+    # prices: (T x N) aligned closes, pairs: (i, j) column pairs. A position is
+    # one unit long one leg and short the other, so a bar earns the difference of
+    # the two simple returns. Returns per-pair stats and the closed trades, with
+    # the n z_score_info() predicted at each entry next to the bars actually held
+    i, j = np.asarray(pairs).T
+    ratio = (prices[:,i]/prices[:,j]).T
+    z = rolling_z(ratio, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = prices[1:]/prices[:-1] - 1
+    spread = np.nan_to_num((returns[:,i] - returns[:,j]).T)  # long stock1, short stock2
+
+    count, length = ratio.shape
+    position = np.zeros(count)
+    held = np.zeros(count, dtype=int)
+    trade_pnl = np.zeros(count)
+    entered = np.zeros(count, dtype=int)
+    predicted = np.zeros(count, dtype=int)
+    pnl = np.zeros(count)
+    changes = np.zeros(count)
+    closed_trades = []
+
+    for t in range(window, length):
+        if t > window:
+            daily = position*spread[:,t-1]
+            pnl += daily
+            trade_pnl += daily
+            held += position != 0
+
+        open_ = position != 0
+        closing = open_ & ((np.abs(z[:,t]) <= exit) | (held >= max_hold) | (np.sign(z[:,t]) == position))
+        rows = np.flatnonzero(closing)
+        if rows.size:
+            closed_trades.append((rows, entered[rows], np.full(rows.size, t), trade_pnl[rows], held[rows], predicted[rows]))
+        position[closing] = 0
+        changes += closing
+
+        opening = (position == 0) & (np.abs(z[:,t]) > entry)
+        rows = np.flatnonzero(opening)
+        if rows.size:
+            position[rows] = -np.sign(z[rows,t])
+            entered[rows] = t
+            held[rows] = 0
+            trade_pnl[rows] = 0
+            predicted[rows] = predicted_horizon(z, t, rows, min(horizon, t), exit)
+            changes += opening
+
+    fields = ['pair', 'entry', 'exit', 'pnl', 'held', 'predicted']
+    trades = np.zeros(sum(len(rows) for rows, *_ in closed_trades), dtype=[(name, float if name == 'pnl' else int) for name in fields])
+    for k, column in enumerate(fields):
+        trades[column] = np.concatenate([closed[k] for closed in closed_trades]) if closed_trades else []
+    stats = np.zeros(count, dtype=[('pnl', float), ('trades', int), ('hit_rate', float), ('mean_held', float),
+                                   ('mean_predicted', float), ('turnover', float)])
+    stats['pnl'] = pnl
+    stats['trades'] = np.bincount(trades['pair'], minlength=count)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stats['hit_rate'] = np.bincount(trades['pair'], trades['pnl'] > 0, count)/stats['trades']
+        stats['mean_held'] = np.bincount(trades['pair'], trades['held'], count)/stats['trades']
+        stats['mean_predicted'] = np.bincount(trades['pair'], trades['predicted'], count)/stats['trades']
+    # opens and closes per bar; each one trades both legs at the full position size
+    stats['turnover'] = changes/max(length-window, 1)
+    return stats, trades
+
+def backtest_windows(prices, pairs, windows=(20, 50, 100), **rules):
+    return {window: backtest_pairs(prices, pairs, window, **rules) for window in windows}
@@ -0,0 +1,86 @@
+from concurrent.futures import ThreadPoolExecutor
+from .data import default_backend
+import numpy as np
+import os
+
+# Histories in batches: one backend.download() per `batch` tickers instead of
+# one history() each, kept as one (T x N) close matrix from the request to
+# the store or the aligned matrix; no per-ticker frames are built
+
+def download(tickers, backend=None, batch=100, period='1y', workers=4):
+    # (dates, T x N closes) of every ticker on the union of the batches' dates
+    backend = backend or default_backend
+    tickers = list(tickers)
+    batches = [tickers[k:k+batch] for k in range(0, len(tickers), batch)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        parts = list(pool.map(lambda names: backend.download(names, period), batches))
+    if len(parts) == 1:
+        return parts[0]
+    dates = np.unique(np.concatenate([d for d, _ in parts]))
+    closes = np.full((len(dates), len(tickers)), np.nan)
+    column = 0
+    for d, c in parts:
+        closes[np.searchsorted(dates, d), column:column+c.shape[1]] = c
+        column += c.shape[1]
+    return dates, closes
+
+def split(tickers, dates, closes):
+    # ticker -> (dates, closes) of the rows it has a close in
+    histories = {}
+    for column, ticker in enumerate(tickers):
+        valid = ~np.isnan(closes[:,column])
+        if valid.any():
+            histories[ticker] = dates[valid], closes[valid, column]
+    return histories
+
+def to_store(store, tickers, dates, closes):
+    # appends every column to the store, returns how many tickers had closes
+    histories = split(tickers, dates, closes)
+    for ticker, (d, c) in histories.items():
+        store.append(ticker, d, c)
+    return len(histories)
+
+def aligned(tickers, dates, closes, days=180, fill=True):
+    # align.aligned_prices() straight from a downloaded matrix, one column per
+    # ticker in order; a ticker without closes is a column of NaN
+    from .align import aligned_prices
+    series = []
+    for column in range(len(tickers)):
+        valid = ~np.isnan(closes[:,column])
+        series.append((dates[valid], closes[valid, column]))
+    return aligned_prices(series, days, fill)
+
+class FixtureBackend:
+    # replays a recorded download: fixtures/<name>.npz holds dates, tickers and
+    # the close matrix, and any batch of them is answered from it offline
+    def __init__(self, path):
+        data = np.load(path)
+        self.dates = data['dates'].astype('datetime64[D]')
+        self.tickers = data['tickers'].tolist()
+        self.closes = data['closes']
+        self.columns = {ticker: k for k, ticker in enumerate(self.tickers)}
+        self.requests = 0
+
+    def download(self, tickers, period='1y'):
+        self.requests += 1
+        closes = np.full((len(self.dates), len(tickers)), np.nan)
+        for k, ticker in enumerate(tickers):
+            if ticker in self.columns:
+                closes[:,k] = self.closes[:,self.columns[ticker]]
+        rows = ~np.isnan(closes).all(axis=1)  # like yfinance, only dates some ticker traded
+        return self.dates[rows], closes[rows]
+
+    def history(self, ticker, period='1y'):
+        if ticker not in self.columns:
+            raise KeyError(ticker)
+        return split([ticker], *self.download([ticker], period))[ticker]
+
+    def info(self, ticker):
+        raise KeyError(ticker)
+
+def record(path, tickers, backend=None, batch=100, period='1y'):
+    # saves a download for FixtureBackend
+    dates, closes = download(tickers, backend, batch, period)
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.savez_compressed(path, dates=dates.astype(np.int64), tickers=np.array(list(tickers)), closes=closes)
@@ -0,0 +1,90 @@
+from .pairs import covariance, correlation, z_score_info, cov_corr_matrices, z_info_condensed
+from .pipeline import tangency
+from .data import FakeBackend
+import numpy as np
+import subprocess
+import argparse
+import platform
+import json
+import time
+import csv
+
+# offline benchmarks of the pairwise and portfolio hot paths on synthetic
+# prices:  python -m stock_bot.bench --sizes 100 500 1000 --out bench.json
+
+def universe(size, length=252, factors=5, seed=0):
+    # correlated GBM closes: daily log returns load on a few common factors
+    rng = np.random.default_rng(seed)
+    loadings = rng.normal(0, 0.01, (size, factors))
+    noise = rng.uniform(0.005, 0.03, size)
+    log_returns = rng.normal(size=(length, factors)) @ loadings.T + rng.normal(size=(length, size))*noise
+    closes = rng.uniform(10, 500, size)*np.exp(np.cumsum(log_returns, axis=0))
+    dates = np.busday_offset('2024-01-02', np.arange(length), roll='forward')
+    tickers = [f'S{i:05d}' for i in range(size)]
+    histories = {ticker: (dates, closes[:,i]) for i, ticker in enumerate(tickers)}
+    infos = {ticker: {'marketCap': int(rng.integers(10**9, 10**12)), 'shortName': ticker,
+                      'dividendYield': round(float(rng.uniform(0, 0.08)), 4)} for ticker in tickers}
+    return tickers, FakeBackend(histories, infos)
+
+def timed(function, *args, repeat=1):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter()-start)
+    return best
+
+def run(sizes, pairs=2000, repeat=3):
+    rows = []
+    for size in sizes:
+        tickers, backend = universe(size)
+        histories = [backend.histories[ticker][1][-180:] for ticker in tickers]
+        rng = np.random.default_rng(size)
+        sample = rng.integers(0, size, (min(pairs, size*size), 2))
+
+        def per_pair(function, days):
+            return lambda: [function(histories[i], histories[j], days) for i, j in sample]
+
+        stages = {
+            'covariance': (per_pair(covariance, 180), len(sample)),
+            'correlation': (per_pair(correlation, 180), len(sample)),
+            'z_score_info': (per_pair(z_score_info, 50), len(sample)),
+            'cov_corr_matrices': (lambda: cov_corr_matrices(histories, 180), size*(size+1)//2),
+            'z_info_condensed': (lambda: z_info_condensed(np.column_stack(histories)), size*(size-1)//2),
+            'tangency': (lambda: tangency(tickers, backend=backend), size),
+        }
+        for stage, (function, count) in stages.items():
+            seconds = timed(function, repeat=1 if stage in ('z_info_condensed', 'tangency') and size >= 1000 else repeat)
+            rows.append({'stage': stage, 'size': size, 'seconds': seconds, 'count': count, 'per_item': seconds/count})
+            print(f'{stage:>18} N={size:<5} {seconds:10.4f}s')
+    return rows
+
+def revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ''
+
+def main():
+    parser = argparse.ArgumentParser(description='benchmark the pairwise and portfolio hot paths')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 500, 1000, 5000])
+    parser.add_argument('--pairs', type=int, default=2000, help='pairs timed for the scalar functions')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--out', default='bench.json', help='.json or .csv report')
+    args = parser.parse_args()
+
+    rows = run(args.sizes, args.pairs, args.repeat)
+    meta = {'revision': revision(), 'python': platform.python_version(), 'numpy': np.__version__,
+            'machine': platform.machine(), 'time': time.strftime('%Y-%m-%dT%H:%M:%S')}
+    if args.out.endswith('.csv'):
+        with open(args.out, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=[*meta, *rows[0]])
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({**meta, **row})
+    else:
+        with open(args.out, 'w') as f:
+            json.dump({**meta, 'results': rows}, f, indent=1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+from concurrent.futures import ThreadPoolExecutor
+from .schedule import Scheduler, transient
+import numpy as np
+import threading
+import random
+import time
+
+days = 180
+
+class YFinanceBackend:
+    def info(self, ticker):
+        import yfinance as yf
+        return yf.Ticker(ticker).info
+
+    def history(self, ticker, period='1y'):
+        import yfinance as yf
+        hist = yf.Ticker(ticker).history(period=period).loc[:,'Close']
+        dates = hist.index.tz_localize(None).values.astype('datetime64[D]')
+        return dates, hist.to_numpy(dtype=float)
+
+    def download(self, tickers, period='1y'):
+        # one request for many tickers: (dates, T x N closes), NaN where a
+        # ticker has no close, columns in the order of `tickers`
+        import yfinance as yf
+        frame = yf.download(list(tickers), period=period, auto_adjust=True, group_by='column', progress=False, threads=False)
+        closes = frame['Close'].reindex(columns=list(tickers))
+        index = closes.index if closes.index.tz is None else closes.index.tz_localize(None)
+        return index.values.astype('datetime64[D]'), closes.to_numpy(dtype=float)
+
+class HTTPError(IOError):
+    def __init__(self, status):
+        super().__init__(f'HTTP {status}')
+        self.status = status
+
+class FakeBackend:
+    # offline stand-in for yfinance: seeded random walks per ticker. limit makes
+    # it answer 429 beyond `limit` requests per second, like the real thing;
+    # throttle answers 429 to that fraction of requests at random
+    def __init__(self, histories=None, infos=None, length=252, latency=0, seed=0, limit=None, throttle=0):
+        self.histories = histories or {}
+        self.infos = infos or {}
+        self.length = length
+        self.latency = latency
+        self.seed = seed
+        self.limit = limit
+        self.throttle = throttle
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.allowance = limit
+        self.stamp = time.monotonic()
+        self.requests = 0
+        self.refused = 0
+
+    def _serve(self):
+        if self.latency:
+            time.sleep(self.latency)
+        with self.lock:
+            self.requests += 1
+            refuse = self.throttle and self.random.random() < self.throttle
+            if self.limit is not None:
+                now = time.monotonic()
+                self.allowance = min(self.limit, self.allowance + (now-self.stamp)*self.limit)
+                self.stamp = now
+                refuse = refuse or self.allowance < 1
+                if not refuse:
+                    self.allowance -= 1
+            if refuse:
+                self.refused += 1
+                raise HTTPError(429)
+
+    def _rng(self, ticker):
+        return np.random.default_rng([self.seed, *ticker.encode()])
+
+    def info(self, ticker):
+        self._serve()
+        if ticker in self.infos:
+            return self.infos[ticker]
+        if not ticker:
+            raise KeyError(ticker)
+        rng = self._rng(ticker)
+        dates, closes = self._history(ticker)
+        return {'marketCap': int(rng.integers(10**9, 10**12)),
+                'dividendYield': round(float(rng.uniform(0, 0.08)), 4),
+                'shortName': ticker, 'currentPrice': float(closes[-1]),
+                'firstTradeDateEpochUtc': int(dates[0].astype('datetime64[s]').astype(int))}
+
+    def history(self, ticker, period='1y'):
+        self._serve()
+        return self._history(ticker)
+
+    def download(self, tickers, period='1y'):
+        self._serve()
+        series = []
+        for ticker in tickers:
+            try:
+                series.append(self._history(ticker))
+            except KeyError:
+                series.append((np.array([], dtype='datetime64[D]'), np.array([])))
+        return merge(series)
+
+    def _history(self, ticker):
+        if ticker in self.histories:
+            dates, closes = self.histories[ticker]
+            return np.asarray(dates, dtype='datetime64[D]'), np.asarray(closes, dtype=float)
+        if not ticker:
+            raise KeyError(ticker)
+        rng = self._rng(ticker)
+        closes = rng.uniform(5, 500)*np.exp(np.cumsum(rng.normal(0, 0.02, self.length)))
+        dates = np.busday_offset('2024-01-02', np.arange(self.length), roll='forward')
+        return dates, closes
+
+def merge(series):
+    # (dates, closes) pairs on the union of their dates: (dates, T x N closes)
+    dates = np.unique(np.concatenate([np.asarray(d, dtype='datetime64[D]') for d, _ in series]))
+    closes = np.full((len(dates), len(series)), np.nan)
+    for column, (d, c) in enumerate(series):
+        closes[np.searchsorted(dates, np.asarray(d, dtype='datetime64[D]')), column] = c
+    return dates, closes
+
+default_backend = Scheduler(YFinanceBackend())
+
+class Stock:
+    def __init__(self, ticker, backend=None, store=None):
+        self.ticker = ticker
+        self.backend = backend or default_backend
+        self.store = store
+        self.info = None
+        self.history = None
+        self.dates = None
+        self.price = None
+        self.marketcap = None
+
+    def period(self):
+        # only fetch what the store is missing
+        last_date = None if self.store is None else self.store.last_date(self.ticker)
+        if last_date is None:
+            return '1y'
+        gap = (np.datetime64('today', 'D') - last_date).astype(int)
+        if gap <= 5:
+            return '5d'
+        if gap <= 28:
+            return '1mo'
+        return '1y'
+
+    def update(self, require_dividend=False):
+        # 'throttled' is a failure a later run may not have; 'no info' and
+        # 'no data' are the backend's answer for this ticker
+        try:
+            self.info = self.backend.info(self.ticker)
+        except Exception as e:
+            return 'throttled' if transient(e) else 'no info'
+        self.marketcap = self.info.get('marketCap')
+        period = self.period()
+        try:
+            dates, hist = self.backend.history(self.ticker, period)
+        except Exception as e:
+            return 'throttled' if transient(e) else 'no data'
+
+        if require_dividend and self.info.get('dividendYield') is None:
+            return 'no dividend'
+
+        if self.store is not None:
+            self.store.append(self.ticker, dates, hist)
+            dates = self.store.dates(self.ticker, days)
+            hist = self.store.closes(self.ticker, days)
+        self.dates = dates[-days:]
+        self.history = hist[-days:]
+        if self.history.size < days:
+            return 'not enough data'
+        self.price = self.history[-1]
+        if self.price < 5:
+            return 'penny stock'
+        return 0
+
+def _load(stock, require_dividend):
+    start = time.perf_counter()
+    exception = stock.update(require_dividend)
+    return stock, exception, time.perf_counter()-start
+
+def load_stocks(tickers, backend=None, workers=16, require_dividend=False, store=None):
+    # fetches every ticker concurrently, returns (stock, exception, seconds) in ticker order
+    stocks = [Stock(ticker, backend, store) for ticker in tickers]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda stock: _load(stock, require_dividend), stocks))
+
+def accepted(results):
+    return [stock for stock, exception, _ in results if exception == 0]
+
+def rejected(results):
+    counts = {}
+    for _, exception, _ in results:
+        if exception != 0:
+            counts[exception] = counts.get(exception, 0)+1
+    return counts
@@ -0,0 +1,59 @@
+import numpy as np
+
+# Covariance estimators for universes wider than the 179-return window, where
+# the sample covariance is singular. All take a (T x N) returns matrix and use
+# the same normalization as pairs.covariance(): centered, divided by T
+
+def returns_matrix(prices):
+    # daily price changes of an aligned (T x N) price matrix; missing ones count as 0
+    r = prices[1:]-prices[:-1]
+    return np.where(np.isnan(r), 0, r)
+
+def sample(returns):
+    centered = returns - returns.mean(axis=0)
+    return centered.T @ centered/len(returns)
+
+def ledoit_wolf(returns):
+    # Ledoit & Wolf (2004): shrink towards mean-variance*I with the intensity
+    # that minimizes the expected Frobenius loss. Returns (cov_matrix, shrinkage)
+    centered = returns - returns.mean(axis=0)
+    m, size = centered.shape
+    cov_matrix = centered.T @ centered/m
+    mu = np.trace(cov_matrix)/size
+    d2 = np.sum(cov_matrix**2) - 2*mu*np.trace(cov_matrix) + mu**2*size
+    # sum_k |x_k x_k' - S|^2 = sum_k |x_k|^4 - m |S|^2
+    b2 = (np.sum(np.einsum('ij,ij->i', centered, centered)**2) - m*np.sum(cov_matrix**2))/m**2
+    shrinkage = 0 if d2 == 0 else min(b2, d2)/d2
+    cov_matrix *= 1-shrinkage
+    cov_matrix[np.diag_indices(size)] += shrinkage*mu
+    return cov_matrix, shrinkage
+
+class FactorModel:
+    # C = B B' + diag(residual) from the top k principal components; keeps
+    # N*k numbers instead of N*N and solves with the Woodbury identity in O(N*k^2)
+    def __init__(self, returns, k=10, floor=1e-12):
+        centered = returns - returns.mean(axis=0)
+        m = len(centered)
+        _, s, vt = np.linalg.svd(centered, full_matrices=False)
+        k = min(k, len(s))
+        self.loadings = vt[:k].T*(s[:k]/np.sqrt(m))
+        variance = np.einsum('ij,ij->j', centered, centered)/m
+        self.residual = np.maximum(variance - np.einsum('ij,ij->i', self.loadings, self.loadings), floor*variance.max())
+
+    @property
+    def shape(self):
+        size = len(self.residual)
+        return size, size
+
+    def __matmul__(self, x):
+        return self.loadings @ (self.loadings.T @ x) + (self.residual*x.T).T
+
+    def dense(self):
+        return self.loadings @ self.loadings.T + np.diag(self.residual)
+
+    def solve(self, rhs):
+        # (D + B B')^-1 = D^-1 - D^-1 B (I + B' D^-1 B)^-1 B' D^-1
+        scaled = (rhs.T/self.residual).T
+        b_scaled = (self.loadings.T/self.residual).T
+        inner = np.eye(self.loadings.shape[1]) + self.loadings.T @ b_scaled
+        return scaled - b_scaled @ np.linalg.solve(inner, self.loadings.T @ scaled)
@@ -0,0 +1,127 @@
+from concurrent.futures import ThreadPoolExecutor
+from .data import default_backend
+from .schedule import transient
+import threading
+import sqlite3
+import json
+import time
+import os
+
+day = 24*60*60
+
+# seconds before a cached field is refreshed
+ttls = {'marketCap': day, 'dividendYield': day, 'currentPrice': day, 'shortName': 7*day, 'longName': 7*day,
+        'firstTradeDateEpochUtc': 30*day}
+# seconds a ticker the backend has no info for is answered from the cache
+negative_ttl = 6*60*60
+
+class InfoCache:
+    # a backend wrapper that answers info() from an sqlite file. Missing tickers
+    # are fetched right away; stale fields are served as they are and refreshed
+    # on a background thread. A lookup that fails for good (an unknown or
+    # delisted ticker, not a throttle) raises KeyError again for negative_ttl
+    # without asking the backend. history() goes straight to the wrapped backend
+    def __init__(self, backend=None, path='stocks/info.sqlite', ttls=ttls, workers=4, negative_ttl=negative_ttl):
+        self.backend = backend or default_backend
+        self.ttls = ttls
+        self.negative_ttl = negative_ttl
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute('create table if not exists info (ticker text, field text, value text, fetched real, primary key (ticker, field))')
+        self.db.execute('create table if not exists failures (ticker text primary key, error text, fetched real)')
+        self.lock = threading.Lock()
+        self.workers = workers
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.pending = set()
+        self.hits = 0
+        self.misses = 0
+
+    def _read(self, ticker):
+        with self.lock:
+            rows = self.db.execute('select field, value, fetched from info where ticker = ?', (ticker,)).fetchall()
+        return {field: (json.loads(value), fetched) for field, value, fetched in rows}
+
+    def _write(self, ticker, info):
+        now = time.time()
+        rows = [(ticker, field, json.dumps(info.get(field)), now) for field in self.ttls]
+        with self.lock:
+            self.db.executemany('insert or replace into info values (?, ?, ?, ?)', rows)
+            self.db.execute('delete from failures where ticker = ?', (ticker,))
+            self.db.commit()
+
+    def failed(self, ticker):
+        # the error of a failed lookup younger than negative_ttl, or None
+        with self.lock:
+            row = self.db.execute('select error, fetched from failures where ticker = ?', (ticker,)).fetchone()
+        if row is not None and time.time() - row[1] <= self.negative_ttl:
+            return row[0]
+        return None
+
+    def fetch(self, ticker):
+        try:
+            info = self.backend.info(ticker)
+        except Exception as e:
+            if not transient(e):
+                with self.lock:
+                    self.db.execute('insert or replace into failures values (?, ?, ?)', (ticker, repr(e), time.time()))
+                    self.db.commit()
+            raise
+        self._write(ticker, info)
+        return {field: info.get(field) for field in self.ttls}
+
+    def _refresh(self, ticker):
+        try:
+            self.fetch(ticker)
+        except Exception:
+            pass  # keep serving the stale copy
+        finally:
+            with self.lock:
+                self.pending.discard(ticker)
+
+    def stale(self, cached):
+        now = time.time()
+        return [field for field, ttl in self.ttls.items() if field not in cached or now - cached[field][1] > ttl]
+
+    def info(self, ticker):
+        cached = self._read(ticker)
+        if not cached:
+            error = self.failed(ticker)
+            if error is not None:
+                self.hits += 1
+                raise KeyError(f'{ticker}: {error}')
+            self.misses += 1
+            return self.fetch(ticker)
+        self.hits += 1
+        if self.stale(cached):
+            with self.lock:
+                start = ticker not in self.pending
+                self.pending.add(ticker)
+            if start:
+                self.pool.submit(self._refresh, ticker)
+        return {field: value for field, (value, _) in cached.items()}
+
+    def history(self, ticker, period='1y'):
+        return self.backend.history(ticker, period)
+
+    def download(self, tickers, period='1y'):
+        return self.backend.download(tickers, period)
+
+    def preload(self, tickers, workers=16):
+        # fetches every ticker that is missing or stale, returns the failures;
+        # recent failures are not tried again
+        todo, failures = [], []
+        for ticker in tickers:
+            if self.stale(self._read(ticker)):
+                (todo if self.failed(ticker) is None else failures).append(ticker)
+        def load(ticker):
+            try:
+                self.fetch(ticker)
+            except Exception:
+                return ticker
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return failures + [ticker for ticker in pool.map(load, todo) if ticker is not None]
+
+    def wait(self):
+        self.pool.shutdown(wait=True)
+        self.pool = ThreadPoolExecutor(max_workers=self.workers)
@@ -0,0 +1,121 @@
+from collections import namedtuple
+import numpy as np
+import time
+
+# z_score() kept live for a fixed set of pairs. The window holds the last
+# `window` daily ratios as running sums; a tick only moves the current price,
+# so it rescores the pairs of that one ticker in O(1) each, and closing a bar
+# is one add and one remove per pair. Like z_score(), a pair is only scored
+# with a live price against the closes before it: closing a bar scores
+# nothing, the next tick of each pair does
+
+Signal = namedtuple('Signal', 'time ticker1 ticker2 z side')
+# side -1: z > entry, sell ticker1, buy ticker2
+# side  1: z < -entry, buy ticker1, sell ticker2
+# side  0: back inside the band
+
+class ReplayFeed:
+    # `time,ticker,price` lines from a file, e.g. a recorded session; with
+    # speed, sleeps so the replay runs `speed` times faster than recorded
+    def __init__(self, path, speed=None):
+        self.path = path
+        self.speed = speed
+
+    def __iter__(self):
+        started = None
+        with open(self.path) as f:
+            for line in f:
+                if not line.strip() or line.startswith('time'):
+                    continue
+                stamp, ticker, price = line.strip().split(',')
+                stamp = np.datetime64(stamp)
+                if self.speed:
+                    if started is None:
+                        started = (stamp, time.monotonic())
+                    wait = (stamp-started[0])/np.timedelta64(1, 's')/self.speed - (time.monotonic()-started[1])
+                    if wait > 0:
+                        time.sleep(wait)
+                yield stamp, ticker, float(price)
+
+class PairMonitor:
+    def __init__(self, pairs, histories, window=50, entry=2, resync=250):
+        # pairs: (ticker1, ticker2); histories: ticker -> daily closes, at least `window`
+        self.tickers = sorted({ticker for pair in pairs for ticker in pair})
+        self.columns = {ticker: k for k, ticker in enumerate(self.tickers)}
+        self.pairs = list(pairs)
+        self.i = np.array([self.columns[t1] for t1, _ in self.pairs], dtype=int)
+        self.j = np.array([self.columns[t2] for _, t2 in self.pairs], dtype=int)
+        rows = [[] for _ in self.tickers]
+        for row, (i, j) in enumerate(zip(self.i, self.j)):
+            rows[i].append(row)
+            rows[j].append(row)
+        self.rows = [np.array(r, dtype=int) for r in rows]
+
+        closes = np.stack([np.asarray(histories[ticker], dtype=float)[-window:] for ticker in self.tickers], axis=1)
+        if len(closes) < window:
+            raise ValueError(f'need {window} closes, got {len(closes)}')
+        self.window = window
+        self.entry = entry
+        self.resync = resync
+        ratios = (closes[:,self.i]/closes[:,self.j]).T
+        self.shift = ratios.mean(axis=1)  # sums are kept around this to stay small
+        self.ratios = ratios - self.shift[:,None]  # ring buffer, oldest at head
+        self.head = 0
+        self.rolls = 0
+        self._rebuild()
+        self.last = closes[-1].copy()
+        self.date = None
+        self.z = np.zeros(len(self.pairs))  # 0 until a pair's first tick
+        self.side = np.zeros(len(self.pairs), dtype=int)
+
+    @classmethod
+    def from_store(cls, store, pairs, window=50, **kwargs):
+        tickers = {ticker for pair in pairs for ticker in pair}
+        return cls(pairs, {ticker: store.closes(ticker, window) for ticker in tickers}, window, **kwargs)
+
+    def _rebuild(self):
+        self.sums = self.ratios.sum(axis=1)
+        self.squares = (self.ratios**2).sum(axis=1)
+        self.rolls = 0
+
+    def _score(self, rows, stamp=None):
+        ratio = self.last[self.i[rows]]/self.last[self.j[rows]] - self.shift[rows]
+        mean = self.sums[rows]/self.window
+        std = np.sqrt(np.maximum(self.squares[rows]/self.window - mean**2, 0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z = np.where(std > 0, (ratio-mean)/std, 0)
+        side = np.where(np.abs(z) > self.entry, -np.sign(z), 0).astype(int)
+        crossed = rows[side != self.side[rows]]
+        self.z[rows] = z
+        self.side[rows] = side
+        return [Signal(stamp, *self.pairs[row], float(self.z[row]), int(self.side[row])) for row in crossed]
+
+    def tick(self, ticker, price, stamp=None):
+        # returns the signals of pairs whose |z| crossed entry
+        column = self.columns.get(ticker)
+        if column is None:
+            return []
+        self.last[column] = price
+        return self._score(self.rows[column], stamp)
+
+    def close_bar(self):
+        # the current prices become the newest daily close of every window
+        ratio = self.last[self.i]/self.last[self.j] - self.shift
+        old = self.ratios[:,self.head]
+        self.sums += ratio-old
+        self.squares += ratio**2-old**2
+        self.ratios[:,self.head] = ratio
+        self.head = (self.head+1) % self.window
+        self.rolls += 1
+        if self.rolls >= self.resync:
+            self._rebuild()
+
+    def run(self, feed, on_signal=print):
+        # consumes (time, ticker, price) updates, closing a bar when the day changes
+        for stamp, ticker, price in feed:
+            date = np.datetime64(stamp, 'D')
+            if self.date is not None and date > self.date:
+                self.close_bar()
+            self.date = date
+            for signal in self.tick(ticker, price, stamp):
+                on_signal(signal)
@@ -0,0 +1,294 @@
+import heapq
+import numpy as np
+
+def covariance(stock1, stock2, days):
+    days = min(len(stock1), len(stock2), days)
+
+    stock1_p = stock1[-days:]
+    stock2_p = stock2[-days:]
+
+    stock1_r = stock1_p[1:] - stock1_p[:-1]
+    stock2_r = stock2_p[1:] - stock2_p[:-1]
+
+    mu1 = np.mean(stock1_r)
+    mu2 = np.mean(stock2_r)
+
+    return np.dot(stock1_r-mu1, stock2_r-mu2)/(days-1)
+
+def correlation(stock1, stock2, days):
+    days = min(len(stock1),len(stock2),days)
+
+    stock1_p = stock1[-days:]
+    stock2_p = stock2[-days:]
+
+    stock1_r = stock1_p[1:]-stock1_p[:-1]
+    stock2_r = stock2_p[1:]-stock2_p[:-1]
+
+    s_xy = np.sum(stock1_r*stock2_r)
+
+    s_x = np.sum(stock1_r)
+    s_y = np.sum(stock2_r)
+
+    s_x2 = np.sum(stock1_r**2)
+    s_y2 = np.sum(stock2_r**2)
+
+    n = days
+    return (n*s_xy - s_x*s_y)/np.sqrt((n*s_x2 - s_x**2)*(n*s_y2 - s_y**2))
+
+def z_score(stock1, stock2, days):
+    # assuming a very high correlation
+    # z-score > 2: sell stock1, buy stock2
+    # z-score < -2: buy stock1, sell stock2
+
+    days = min(len(stock1), len(stock2), days)
+
+    ratio = stock1[-days-1:]/stock2[-days-1:]
+    mu = np.mean(ratio[:-1])
+    std = np.std(ratio[:-1])
+    if std == 0:
+        return 0
+    return (ratio[-1]-mu)/std
+
+def z_score_info(stock1, stock2, days):
+    days = max(len(stock1), len(stock2), days)
+
+    current = z_score(stock1, stock2, days)
+    n = 1
+    if np.abs(current) > 0.5:
+        while np.abs(z_score(stock1[:-n], stock2[:-n], days)) > 0.5:
+            n += 1
+            if n > 14:
+                return current, 1, 0, 0
+    ratio = stock1[-1]/stock2[-1]
+    normal_ratio = stock1[-n]/stock2[-n]
+
+    c = ratio/normal_ratio
+    root = np.sqrt(c)
+    s1_gain = 1/root-1
+    s2_gain = root-1
+    return current, n, s1_gain, s2_gain
+
+def cov_corr_matrices(histories, days):
+    # all-pairs covariance() and correlation() at once; a pair uses the last
+    # min(len1, len2, days) prices, so stocks are grouped by window length.
+    # Positional like the scalar functions: cov_corr_aligned() takes the
+    # date-aligned matrix
+    lengths = np.array([min(len(h), days) for h in histories])
+    size = len(histories)
+    cov_matrix = np.zeros((size,size))
+    corr_matrix = np.zeros((size,size))
+    for w in np.unique(lengths):
+        rows = np.flatnonzero(lengths == w)
+        cols = np.flatnonzero(lengths >= w)
+        prices = np.stack([np.asarray(histories[i][-w:], dtype=float) for i in cols], axis=1)
+        r = prices[1:]-prices[:-1]
+        picked = np.searchsorted(cols, rows)
+
+        centered = r - r.mean(axis=0)
+        cov = centered[:,picked].T @ centered/(w-1)
+
+        s = r.sum(axis=0)
+        s2 = np.einsum('ij,ij->j', r, r)
+        sxy = r[:,picked].T @ r
+        corr = (w*sxy - np.outer(s[picked], s))/np.sqrt(np.outer(w*s2[picked] - s[picked]**2, w*s2 - s**2))
+
+        cov_matrix[np.ix_(rows, cols)] = cov
+        cov_matrix[np.ix_(cols, rows)] = cov.T
+        corr_matrix[np.ix_(rows, cols)] = corr
+        corr_matrix[np.ix_(cols, rows)] = corr.T
+    return cov_matrix, corr_matrix
+
+def _z_score_lags(ratio, lags):
+    # z_score() of every row of ratio truncated by 0..lags bars: each lag is
+    # the last point against the mean/std of everything before it
+    length = ratio.shape[1]
+    d = ratio - ratio.mean(axis=1, keepdims=True)
+    c1 = np.cumsum(d, axis=1)
+    c2 = np.cumsum(d**2, axis=1)
+
+    k = length-1-np.arange(lags+1)  # prefix lengths for lag 0..lags
+    mean = c1[:,k-1]/k
+    std = np.sqrt(np.maximum(c2[:,k-1]/k - mean**2, 0))
+    last = d[:,k]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = np.where(std == 0, 0, (last-mean)/std)
+    return z
+
+def z_score_info_rows(prices, i, cols, horizon=14, threshold=0.5):
+    # z_score_info(prices[i], prices[j], ...) for every j in cols
+    ratio = prices[i]/prices[cols]
+    z = _z_score_lags(ratio, horizon)
+    current = z[:,0]
+
+    reverted = np.abs(z[:,1:]) <= threshold
+    n = np.argmax(reverted, axis=1)+1
+    never = ~reverted.any(axis=1)
+    n[np.abs(current) <= threshold] = 1
+
+    c = ratio[:,-1]/ratio[np.arange(len(cols)), -n]
+    root = np.sqrt(c)
+    s1_gain = 1/root-1
+    s2_gain = root-1
+
+    stuck = never & (np.abs(current) > threshold)
+    n[stuck] = 1
+    s1_gain[stuck] = 0
+    s2_gain[stuck] = 0
+    return current, n, s1_gain, s2_gain
+
+def z_score_info_matrices(histories, horizon=14, threshold=0.5):
+    # all-pairs z_score_info(); like the scalar version the window is the full
+    # history, so histories are cut to their common length. Positional like
+    # the scalar function: z_info_condensed() takes the date-aligned matrix
+    length = min(len(h) for h in histories)
+    prices = np.stack([np.asarray(h[-length:], dtype=float) for h in histories])
+    size = len(histories)
+    z_matrix = np.zeros((size,size))
+    n_matrix = np.ones((size,size), dtype=int)
+    s1_matrix = np.zeros((size,size))
+    s2_matrix = np.zeros((size,size))
+    for i in range(size):
+        cols = np.arange(i, size)
+        current, n, s1_gain, s2_gain = z_score_info_rows(prices, i, cols, horizon, threshold)
+        z_matrix[i,i:] = current
+        z_matrix[i:,i] = -current
+        n_matrix[i,i:] = n
+        n_matrix[i:,i] = n
+        s1_matrix[i,i:] = s1_gain
+        s1_matrix[i:,i] = s2_gain
+        s2_matrix[i,i:] = s2_gain
+        s2_matrix[i:,i] = s1_gain
+    return z_matrix, n_matrix, s1_matrix, s2_matrix
+
+z_info_dtype = np.dtype([('z', np.float32), ('horizon', np.int8), ('s1_gain', np.float32), ('s2_gain', np.float32)])
+
+class ZInfo:
+    # z_score_info() of every pair i < j packed in condensed (row-major upper
+    # triangle) order, 13 bytes a pair; the j > i half is the mirror image
+    def __init__(self, size):
+        self.size = size
+        self.data = np.zeros(size*(size-1)//2, dtype=z_info_dtype)
+        self.data['horizon'] = 1
+
+    def offset(self, i):
+        return i*self.size - i*(i+1)//2
+
+    def row(self, i):
+        # the pairs (i, i+1..size-1)
+        start = self.offset(i)
+        return self.data[start:start+self.size-i-1]
+
+    def __getitem__(self, key):
+        i, j = key
+        if i == j:
+            return 0.0, 1, 0.0, 0.0
+        if i < j:
+            z, n, s1_gain, s2_gain = self.data[self.offset(i)+j-i-1].tolist()
+            return z, n, s1_gain, s2_gain
+        z, n, s1_gain, s2_gain = self.data[self.offset(j)+i-j-1].tolist()
+        return -z, n, s2_gain, s1_gain
+
+    def indices(self):
+        return np.triu_indices(self.size, 1)
+
+    def qualifying(self, corr_matrix, min_corr=0.7, min_gain=0.0001):
+        # the -07-13 report filter: |corr| > 0.7, a non-trivial horizon and gain
+        i, j = self.indices()
+        data = self.data
+        mask = (np.abs(corr_matrix[i,j]) > min_corr) & (data['horizon'] != 1)
+        mask &= (np.abs(data['s1_gain']) > min_gain) | (np.abs(data['s2_gain']) > min_gain)
+        return np.flatnonzero(mask)
+
+    def report(self, tickers, corr_matrix, min_corr=0.7, min_z=2):
+        # (ticker1, ticker2, n, s1_gain, s2_gain, corr, z) sorted by s1_gain
+        picked = self.qualifying(corr_matrix, min_corr)
+        picked = picked[np.argsort(self.data['s1_gain'][picked], kind='stable')]
+        i, j = self.indices()
+        pairs = []
+        for k in picked:
+            z, n, s1_gain, s2_gain = self.data[k].tolist()
+            z = z if np.abs(z) >= min_z else 0
+            pairs.append((tickers[i[k]], tickers[j[k]], n, s1_gain, s2_gain, corr_matrix[i[k],j[k]], z))
+        return pairs
+
+def _rows(prices, days=None):
+    # the (N x T) price rows the engines work on, from a (T x N) matrix of
+    # align.aligned_prices(): its last `days` rows, starting at the first one
+    # where every ticker has a price (the common length the scalar functions cut to)
+    prices = np.asarray(prices, dtype=float)
+    if days is not None:
+        prices = prices[-days:]
+    complete = np.flatnonzero(~np.isnan(prices).any(axis=1))
+    return np.ascontiguousarray(prices[complete[0] if complete.size else len(prices):].T)
+
+def z_info_condensed(prices, horizon=14, threshold=0.5):
+    # z_score_info_matrices() as a ZInfo, on a (T x N) date-aligned price matrix
+    prices = _rows(prices)
+    size = len(prices)
+    z_info = ZInfo(size)
+    for i in range(size-1):
+        row = z_info.row(i)
+        row['z'], row['horizon'], row['s1_gain'], row['s2_gain'] = z_score_info_rows(prices, i, np.arange(i+1, size), horizon, threshold)
+    return z_info
+
+def scan_pairs(prices, tickers, k=100, block=64, min_corr=0.7, min_z=2, horizon=14, threshold=0.5, min_gain=0.0001):
+    # pair-trade candidates without the N x N matrices: rows are processed in
+    # blocks, z-scores are only computed for pairs that pass the correlation
+    # filter, and a bounded heap keeps the k lowest s1_gain candidates. prices
+    # is a (T x N) date-aligned matrix; the last 180 rows are used
+    prices = _rows(prices, 180)
+    size, length = prices.shape
+    r = prices[:,1:]-prices[:,:-1]
+    s = r.sum(axis=1)
+    s2 = np.einsum('ij,ij->i', r, r)
+    spread = length*s2 - s**2
+
+    heap = []
+    count = 0
+    for start in range(0, size-1, block):
+        rows = np.arange(start, min(start+block, size-1))
+        sxy = r[rows] @ r.T
+        corr_block = (length*sxy - np.outer(s[rows], s))/np.sqrt(np.outer(spread[rows], spread))
+        for row, i in enumerate(rows):
+            cols = i+1+np.flatnonzero(np.abs(corr_block[row,i+1:]) > min_corr)
+            if cols.size == 0:
+                continue
+            current, n, s1_gain, s2_gain = z_score_info_rows(prices, i, cols, horizon, threshold)
+            # the -07-13 rule: a reversion within the horizon and a non-trivial gain
+            picked = (np.abs(current) >= min_z) & (n != 1)
+            picked &= (np.abs(s1_gain) > min_gain) | (np.abs(s2_gain) > min_gain)
+            for c in np.flatnonzero(picked):
+                j = cols[c]
+                pair = (tickers[i], tickers[j], int(n[c]), s1_gain[c], s2_gain[c], corr_block[row,j], current[c])
+                count += 1
+                # max-heap on s1_gain through negation, count breaks ties in scan order
+                item = (-s1_gain[c], -count, pair)
+                if len(heap) < k:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+    return [pair for _, _, pair in sorted(heap, reverse=True)]
+
+def cov_corr_aligned(prices):
+    # cov_corr_matrices() on a (T x N) date-aligned price matrix from
+    # align.aligned_prices(); NaN prices drop out pairwise, so each pair uses
+    # the returns both stocks have, all through a few matrix products
+    return cov_corr_moments(*moments(prices[1:]-prices[:-1]))
+
+def moments(r):
+    # the pairwise sums cov_corr_aligned() needs; they add up over time, so
+    # the moments of a longer window are a shorter one's plus the extra rows
+    valid = (~np.isnan(r)).astype(float)
+    r = np.where(valid > 0, r, 0)
+    count = valid.T @ valid
+    sums = r.T @ valid  # sums[i,j]: stock i over the returns it shares with j
+    squares = (r**2).T @ valid
+    products = r.T @ r
+    return count, sums, squares, products
+
+def cov_corr_moments(count, sums, squares, products):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov_matrix = (products - sums*sums.T/count)/count
+        n = count+1
+        corr_matrix = (n*products - sums*sums.T)/np.sqrt((n*squares - sums**2)*(n*squares.T - sums.T**2))
+    return cov_matrix, corr_matrix
@@ -0,0 +1,100 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from .pairs import ZInfo, z_info_dtype, z_score_info_rows, _rows
+import numpy as np
+import os
+
+# per-process views of the shared arrays, set up once by _attach
+_shared = {}
+
+def _create(shape, dtype):
+    dtype = np.dtype(dtype)
+    memory = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape))*dtype.itemsize, 1))
+    return memory, np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+
+def _attach(specs):
+    for name, (memory_name, shape, dtype) in specs.items():
+        memory = shared_memory.SharedMemory(name=memory_name)
+        _shared[name] = (memory, np.ndarray(shape, dtype=dtype, buffer=memory.buf))
+
+def _pair_rows(start, stop, horizon, threshold):
+    # fills rows start..stop-1 (pairs j > i) of the shared outputs
+    prices = _shared['prices'][1]
+    corr_matrix = _shared['corr'][1]
+    cov_matrix = _shared['cov'][1]
+    z_data = _shared['z_info'][1]
+    size, length = prices.shape
+    if 'returns' not in _shared:
+        r = prices[:,1:]-prices[:,:-1]
+        s = r.sum(axis=1)
+        spread = length*np.einsum('ij,ij->i', r, r) - s**2
+        _shared['returns'] = (None, (r, s, spread, r - r.mean(axis=1, keepdims=True)))
+    r, s, spread, centered = _shared['returns'][1]
+
+    sxy = r[start:stop] @ r[start:].T
+    corr_matrix[start:stop,start:] = (length*sxy - np.outer(s[start:stop], s[start:]))/np.sqrt(np.outer(spread[start:stop], spread[start:]))
+    cov_matrix[start:stop,start:] = centered[start:stop] @ centered[start:].T/(length-1)
+
+    for i in range(start, stop):
+        if i == size-1:
+            continue
+        offset = i*size - i*(i+1)//2
+        row = z_data[offset:offset+size-i-1]
+        row['z'], row['horizon'], row['s1_gain'], row['s2_gain'] = z_score_info_rows(prices, i, np.arange(i+1, size), horizon, threshold)
+    return stop-start
+
+def shards(size, count):
+    # row ranges holding about the same number of upper-triangle pairs
+    work = np.cumsum(np.arange(size, 0, -1))
+    bounds = np.searchsorted(work, np.linspace(0, work[-1], count+1)[1:-1])
+    bounds = np.unique(np.concatenate([[0], bounds, [size]]))
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+def pair_matrices(prices, workers=None, horizon=14, threshold=0.5, min_z=2):
+    # corr_matrix, cov_matrix, z_matrix and ZInfo for every pair, sharded over a
+    # process pool; prices and outputs live in shared memory so nothing but row
+    # ranges is pickled. prices is a (T x N) date-aligned matrix; the last 180 rows are used
+    workers = workers or os.cpu_count()
+    rows = _rows(prices, 180)
+    size, length = rows.shape
+
+    arrays = {'prices': ((size,length), np.float64), 'corr': ((size,size), np.float64),
+              'cov': ((size,size), np.float64), 'z_info': ((size*(size-1)//2,), z_info_dtype)}
+    memories = {}
+    specs = {}
+    try:
+        for name, (shape, dtype) in arrays.items():
+            memory, array = _create(shape, dtype)
+            memories[name] = (memory, array)
+            specs[name] = (memory.name, shape, dtype)
+        memories['prices'][1][:] = rows
+        memories['z_info'][1]['horizon'] = 1
+
+        tasks = shards(size, 4*workers)
+        if workers == 1:
+            _shared.update(memories)
+            for start, stop in tasks:
+                _pair_rows(start, stop, horizon, threshold)
+        else:
+            with ProcessPoolExecutor(workers, initializer=_attach, initargs=(specs,)) as pool:
+                list(pool.map(_pair_rows, *zip(*tasks), [horizon]*len(tasks), [threshold]*len(tasks)))
+
+        corr_matrix = np.triu(memories['corr'][1])
+        corr_matrix += np.triu(corr_matrix, 1).T
+        cov_matrix = np.triu(memories['cov'][1])
+        cov_matrix += np.triu(cov_matrix, 1).T
+        z_info = ZInfo(size)
+        z_info.data[:] = memories['z_info'][1]
+    finally:
+        _shared.clear()
+        for memory, _ in memories.values():
+            memory.close()
+            memory.unlink()
+
+    i, j = z_info.indices()
+    z = z_info.data['z'].astype(float)
+    z[np.abs(z) < min_z] = 0
+    z_matrix = np.zeros((size,size))
+    z_matrix[i,j] = z
+    z_matrix[j,i] = -z
+    return corr_matrix, cov_matrix, z_matrix, z_info
@@ -0,0 +1,105 @@
+from .pairs import cov_corr_aligned
+from .align import aligned_stocks
+from .data import accepted, rejected, default_backend
+from .portfolio import Frontier, ConstrainedFrontier
+from .rolling import RollingCovariance
+from .screen import Screen
+from .estimators import returns_matrix
+from .trace import Run
+import numpy as np
+import os
+
+risk_free = 0.04495  # US 1-year treasury
+
+def _fetch(tickers, returns, backend, workers, store, run):
+    backend = backend or default_backend
+    hits = getattr(backend, 'hits', 0)
+    misses = getattr(backend, 'misses', 0)
+    with run.stage('fetch'):
+        screen = Screen(run.wrap(backend), store, require_dividend=returns is None, workers=workers)
+        results = screen(tickers)
+    for stage, n in screen.dropped.items():
+        run.count(f'screened: {stage}', n)
+    if hasattr(backend, 'hits'):
+        run.count('cache hits', backend.hits-hits)
+        run.count('cache misses', backend.misses-misses)
+    with run.stage('filter'):
+        stocks = accepted(results)
+        for exception, n in rejected(results).items():
+            run.count(f'rejected: {exception}', n)
+        run.count('accepted', len(stocks))
+    return results, stocks
+
+def tangency(tickers, returns=None, backend=None, workers=16, run=None, estimator=None, bounds=None):
+    # returns=None uses dividend yields as expected returns, like the 2024-08-10 script.
+    # Pass a trace.Run to get the stage timings and counters. estimator maps a
+    # (T x N) returns matrix to a covariance, e.g. estimators.ledoit_wolf or
+    # lambda r: estimators.FactorModel(r, 10); None keeps the sample covariance.
+    # bounds=(lower, upper) limits every weight, e.g. (0, 0.05) for long-only
+    # with a 5% cap
+    run = run or Run()
+    results, stocks = _fetch(tickers, returns, backend, workers, None, run)
+    with run.stage('align'):
+        _, prices, _ = aligned_stocks(stocks, 180)
+    with run.stage('matrix build'):
+        if estimator is None:
+            cov_matrix, _ = cov_corr_aligned(prices)
+        else:
+            cov_matrix = estimator(returns_matrix(prices))
+            if isinstance(cov_matrix, tuple):
+                cov_matrix = cov_matrix[0]
+        run.count('pairs evaluated', len(stocks)*(len(stocks)+1)//2)
+    return _tangency(stocks, results, returns, cov_matrix, run, bounds)
+
+def refresh_tangency(tickers, store, returns=None, backend=None, workers=16, state=None, run=None, bounds=None):
+    # tangency() for a daily run: the store gets today's closes and the
+    # covariance saved by the last run (state, by default next to the store's
+    # price files) is moved forward instead of rebuilt
+    run = run or Run()
+    state = state or os.path.join(store.path, 'covariance.npz')
+    results, stocks = _fetch(tickers, returns, backend, workers, store, run)
+    tickers = [stock.ticker for stock in stocks]
+
+    with run.stage('matrix build'):
+        rolling = None
+        if os.path.exists(state):
+            rolling = RollingCovariance.load(state)
+            if rolling.tickers != tickers:
+                rolling = None
+        if rolling is None:
+            dates, prices, _ = aligned_stocks(stocks, 180)
+            rolling = RollingCovariance(tickers, prices, dates[-1])
+        run.count('days rolled', rolling.refresh(store))
+        rolling.save(state)
+    return _tangency(stocks, results, returns, rolling.cov_matrix(), run, bounds)
+
+def _tangency(stocks, results, returns, cov_matrix, run, bounds=None):
+    tickers = [stock.ticker for stock in stocks]
+    if returns is None:
+        returns = np.array([round(stock.info['dividendYield'], 4) for stock in stocks])
+    else:
+        returns = np.asarray(returns, dtype=float)[[exception == 0 for _, exception, _ in results]]
+
+    if bounds is not None:
+        # no closed form with bounds: the sweep is the solve
+        with run.stage('frontier'):
+            frontier = ConstrainedFrontier(cov_matrix, returns, *bounds)
+            markowitz_risk, markowitz_return, weights = frontier.curve(100)
+            run.count('active set solves', sum(frontier.iterations))
+            if frontier.regularized:
+                run.count('regularized covariance')
+            if frontier.failed:
+                run.count('infeasible frontier points', len(frontier.failed))
+        with run.stage('solve'):
+            best = np.nanargmax((markowitz_return-risk_free)/markowitz_risk)
+            portfolio, portfolio_risk, portfolio_return = weights[best], markowitz_risk[best], markowitz_return[best]
+        return tickers, portfolio, portfolio_risk, portfolio_return, markowitz_risk, markowitz_return, returns, cov_matrix
+
+    with run.stage('solve'):
+        frontier = Frontier(cov_matrix, returns)
+        portfolio, portfolio_risk, portfolio_return = frontier.tangency(risk_free)
+        if frontier.regularized:
+            run.count('regularized covariance')
+    with run.stage('frontier'):
+        markowitz_risk, markowitz_return = frontier.curve(100)
+    return tickers, portfolio, portfolio_risk, portfolio_return, markowitz_risk, markowitz_return, returns, cov_matrix
@@ -0,0 +1,28 @@
+# matplotlib is only imported when something is drawn
+
+def frontier(markowitz_risk, markowitz_return, portfolio_risk=None, portfolio_return=None, risk_free=None):
+    import matplotlib.pyplot as plt
+    plt.plot(markowitz_risk, markowitz_return, label='efficient frontier')
+    if portfolio_risk is not None:
+        plt.scatter([portfolio_risk], [portfolio_return], color='red', label='tangency portfolio')
+        if risk_free is not None:
+            plt.plot([0, portfolio_risk], [risk_free, portfolio_return], color='red', linestyle='--')
+    plt.xlabel('risk')
+    plt.ylabel('return')
+    plt.legend()
+    plt.show()
+
+def pair(stock1, stock2, corr):
+    import matplotlib.pyplot as plt
+    name1 = (stock1.info or {}).get('shortName', stock1.ticker)
+    name2 = (stock2.info or {}).get('shortName', stock2.ticker)
+    plt.plot(stock1.history, label=name1)
+    plt.plot(stock2.history, label=name2)
+    plt.legend()
+    plt.title(f'{name1} and {name2}\n{corr}')
+    plt.show()
+
+def matrix(values, vmin=None, vmax=None):
+    import matplotlib.pyplot as plt
+    plt.matshow(values, cmap='inferno', vmin=vmin, vmax=vmax)
+    plt.show()
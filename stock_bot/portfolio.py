@@ -0,0 +1,360 @@
+import numpy as np
+
+def cholesky(cov_matrix, floor=1e-8):
+    # cho_factor of the covariance, flooring its eigenvalues at floor*largest
+    # when the sample covariance is singular (more names than return days)
+    import scipy.linalg
+    try:
+        return scipy.linalg.cho_factor(cov_matrix, lower=True), cov_matrix
+    except np.linalg.LinAlgError:
+        values, vectors = np.linalg.eigh(cov_matrix)
+        values = np.maximum(values, floor*values.max())
+        cov_matrix = (vectors*values) @ vectors.T
+        return scipy.linalg.cho_factor(cov_matrix, lower=True), cov_matrix
+
+class Frontier:
+    # minimum variance portfolios for  min w'Cw  s.t.  returns'w = mu, sum(w) = 1.
+    # C is a covariance matrix or an object with solve(), like a FactorModel.
+    # A dense C gets one Cholesky factorization and the two multipliers come from the
+    # 2x2 Schur complement [[a, b], [b, c]], so the bordered KKT matrix is never
+    # built. Every frontier portfolio is w0 + mu*w1 and its variance a quadratic
+    # in mu, so the curve costs O(1) per point
+    def __init__(self, cov_matrix, returns, floor=1e-8):
+        self.returns = np.asarray(returns, dtype=float).reshape(-1)
+        rhs = np.column_stack([self.returns, np.ones(self.returns.size)])
+        if hasattr(cov_matrix, 'solve'):
+            # a structured estimator such as estimators.FactorModel solves itself
+            self.cov_matrix = cov_matrix
+            x = cov_matrix.solve(rhs)
+            self.regularized = getattr(cov_matrix, 'regularized', False)
+        else:
+            import scipy.linalg
+            self.factor, self.cov_matrix = cholesky(cov_matrix, floor)
+            self.regularized = self.cov_matrix is not cov_matrix
+            x = scipy.linalg.cho_solve(self.factor, rhs)
+        self.x_r = x[:,0]
+        self.x_1 = x[:,1]
+        self.a = self.returns @ self.x_r
+        self.b = self.returns @ self.x_1
+        self.c = np.sum(self.x_1)
+        self.d = self.a*self.c - self.b**2
+
+    def weights(self, mu):
+        return (self.c*mu - self.b)/self.d*self.x_r + (self.a - self.b*mu)/self.d*self.x_1
+
+    def risk(self, mu):
+        # variance of the frontier portfolio, the 'risk' plotted by the scripts
+        return (self.c*mu**2 - 2*self.b*mu + self.a)/self.d
+
+    def curve(self, points=100):
+        markowitz_return = np.linspace(self.returns.min(), self.returns.max(), points)
+        return self.risk(markowitz_return), markowitz_return
+
+    def tangency(self, risk_free):
+        # maximizes k = (mu-risk_free)/risk with risk the variance, as the scripts do:
+        # dk/dmu = 0  <=>  c*mu^2 - 2*c*risk_free*mu - (a - 2*b*risk_free) = 0
+        mu = risk_free + np.sqrt(risk_free**2 + (self.a - 2*self.b*risk_free)/self.c)
+        return self.weights(mu), self.risk(mu), mu
+
+class BlockSolver:
+    # solves C x = rhs without factorizing C as a whole: conjugate gradients
+    # preconditioned by the Cholesky factors of the diagonal blocks, which are
+    # factorized concurrently. Converges to the full solve (relative residual
+    # below tol), so Frontier(BlockSolver(C), returns) gives the global
+    # tangency portfolio. blocks is a block size or a list of index arrays,
+    # e.g. clusters of the correlation matrix. A singular C (more names than
+    # return days) stalls CG; it is then floored like cholesky() does, with
+    # floor*largest eigenvalue added to the diagonal, and solved again. With a
+    # condition number up to 1/floor the relative residual can stop short of
+    # tol, so that solve is accepted at |b - Cx| <= tol*(|b| + |C||x|). A solve
+    # that misses its test raises RuntimeError
+    def __init__(self, cov_matrix, blocks=100, tol=1e-10, max_iter=None, workers=None, floor=1e-8):
+        self.cov_matrix = cov_matrix
+        size = len(cov_matrix)
+        if isinstance(blocks, int):
+            blocks = [np.arange(start, min(start+blocks, size)) for start in range(0, size, blocks)]
+        self.blocks = [np.asarray(block) for block in blocks]
+        self.tol = tol
+        self.max_iter = max_iter or 10*size
+        self.workers = workers
+        self.floor = floor
+        self.regularized = False
+        self.norm = 0.0  # |C| in the acceptance test once C is floored
+        self.iterations = 0
+        self._factorize()
+
+    def _factorize(self):
+        import scipy.linalg
+        from concurrent.futures import ThreadPoolExecutor
+        self._cho_solve = scipy.linalg.cho_solve
+        cov_matrix = self.cov_matrix
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            self.factors = list(pool.map(lambda block: cholesky(cov_matrix[np.ix_(block, block)], self.floor)[0], self.blocks))
+
+    def regularize(self):
+        from scipy.sparse.linalg import eigsh
+        largest = eigsh(self.cov_matrix, k=1, which='LA', tol=1e-3, return_eigenvectors=False)[0]
+        self.cov_matrix = self.cov_matrix + self.floor*largest*np.eye(len(self.cov_matrix))
+        self.regularized = True
+        self.norm = largest
+        self._factorize()
+
+    def precondition(self, residual):
+        z = np.empty_like(residual)
+        for block, factor in zip(self.blocks, self.factors):
+            z[block] = self._cho_solve(factor, residual[block])
+        return z
+
+    def _cg(self, b):
+        # (x, |b - Cx| relative to |b|, or to |b| + |C||x| once floored)
+        x = np.zeros_like(b)
+        residual = b.copy()
+        z = self.precondition(residual)
+        direction = z.copy()
+        rz = residual @ z
+        norm = np.linalg.norm(b)
+        for iteration in range(self.max_iter):
+            if np.linalg.norm(residual) <= self.tol*norm:
+                break
+            product = self.cov_matrix @ direction
+            curvature = direction @ product
+            if not curvature > 0:
+                break  # C is singular along direction
+            step = rz/curvature
+            x += step*direction
+            residual -= step*product
+            z = self.precondition(residual)
+            rz, previous = residual @ z, rz
+            direction = z + rz/previous*direction
+        self.iterations = max(self.iterations, iteration)
+        scale = norm + self.norm*np.linalg.norm(x)
+        return x, np.linalg.norm(b - self.cov_matrix @ x)/scale if scale else 0.0
+
+    def solve(self, rhs):
+        # one CG run per right-hand side column
+        rhs = np.asarray(rhs, dtype=float)
+        columns = rhs.reshape(len(rhs), -1)
+        x = np.zeros_like(columns)
+        for column in range(columns.shape[1]):
+            x[:,column], error = self._cg(columns[:,column])
+            if not error <= self.tol and not self.regularized:
+                self.regularize()
+                return self.solve(rhs)
+            if not error <= self.tol:
+                raise RuntimeError(f'conjugate gradients stopped at residual {error:.1e} > tol {self.tol:.0e}')
+        return x.reshape(rhs.shape)
+
+def hrp(cov_matrix, corr_matrix):
+    # hierarchical risk parity (Lopez de Prado 2016): single-linkage clusters on
+    # the correlation distance, then inverse-variance splits down the tree.
+    # Long-only weights summing to 1, no matrix inversion
+    from scipy.cluster.hierarchy import linkage, leaves_list
+    from scipy.spatial.distance import squareform
+    distance = np.sqrt(np.clip((1-corr_matrix)/2, 0, None))
+    np.fill_diagonal(distance, 0)
+    order = leaves_list(linkage(squareform(distance, checks=False), 'single'))
+
+    weights = np.ones(len(cov_matrix))
+    clusters = [order]
+    while clusters:
+        clusters = [half for cluster in clusters if len(cluster) > 1
+                    for half in (cluster[:len(cluster)//2], cluster[len(cluster)//2:])]
+        for left, right in zip(clusters[::2], clusters[1::2]):
+            left_risk = _cluster_variance(cov_matrix, left)
+            right_risk = _cluster_variance(cov_matrix, right)
+            alpha = 1 - left_risk/(left_risk+right_risk)
+            weights[left] *= alpha
+            weights[right] *= 1-alpha
+    return weights
+
+def _cluster_variance(cov_matrix, cluster):
+    sub = cov_matrix[np.ix_(cluster, cluster)]
+    inverse_variance = 1/np.diag(sub)
+    w = inverse_variance/inverse_variance.sum()
+    return w @ sub @ w
+
+class ConstrainedFrontier:
+    # the frontier with  lower <= w <= upper  added (long-only: lower=0, a
+    # per-name cap: upper=0.05). Each point is a primal active set solve: from
+    # a feasible start, solve the equality-constrained problem with the names
+    # on a bound held there, step towards it until a free name hits a bound
+    # (which joins the bound set), and at the minimum release the name whose
+    # bound multiplier has the wrong sign, one at a time. Every iterate is
+    # feasible. A frontier sweep starts every point from the previous one, so
+    # most points take one or two solves. Should the bound set come back to
+    # one it has tried, ADMM on the split w = z finishes the point, and a point
+    # ADMM can't make feasible raises RuntimeError. A singular C is floored
+    # once, as Frontier does, so every free block is positive definite
+    def __init__(self, cov_matrix, returns, lower=0.0, upper=1.0, tol=1e-10, max_iter=None, admm_iter=20000, floor=1e-8):
+        import scipy.linalg
+        if hasattr(cov_matrix, 'dense'):
+            cov_matrix = cov_matrix.dense()  # e.g. an estimators.FactorModel
+        cov_matrix = np.asarray(cov_matrix, dtype=float)
+        _, self.cov_matrix = cholesky(cov_matrix, floor)
+        self.regularized = self.cov_matrix is not cov_matrix
+        self.returns = np.asarray(returns, dtype=float).reshape(-1)
+        size = self.returns.size
+        self.lower = np.broadcast_to(np.asarray(lower, dtype=float), (size,))
+        self.upper = np.broadcast_to(np.asarray(upper, dtype=float), (size,))
+        if self.lower.sum() > 1 or self.upper.sum() < 1:
+            raise ValueError('bounds leave no fully invested portfolio')
+        self.tol = tol
+        self.max_iter = max_iter or 4*size+50
+        self.admm_iter = admm_iter
+        self.constraints = np.vstack([self.returns, np.ones(size)])
+        self.scale = np.trace(self.cov_matrix)/size
+        self._cho_solve = scipy.linalg.cho_solve
+        self.ends = [self._fill(np.argsort(self.returns)), self._fill(np.argsort(-self.returns))]
+        self.iterations = []
+        self.failed = []
+
+    def _fill(self, order):
+        # the names filled to their upper bound in `order`: (return, weights)
+        w = self.lower.copy()
+        left = 1 - w.sum()
+        for i in order:
+            step = min(self.upper[i]-w[i], left)
+            w[i] += step
+            left -= step
+        return self.returns @ w, w
+
+    def bounds(self):
+        # lowest and highest reachable return
+        return self.ends[0][0], self.ends[1][0]
+
+    def _equality_solve(self, at_lower, at_upper, target):
+        # min w'Cw  s.t.  constraints w = target  with the active names fixed
+        w = np.where(at_lower, self.lower, np.where(at_upper, self.upper, 0.0))
+        free = ~(at_lower | at_upper)
+        fixed = ~free
+        if not free.any():
+            multipliers = np.linalg.lstsq(self.constraints.T, 2*self.cov_matrix @ w, rcond=None)[0]
+            return w, 2*self.cov_matrix @ w - self.constraints.T @ multipliers
+        constraints = self.constraints[:,free]
+        hessian = 2*self.cov_matrix[np.ix_(free, free)]
+        linear = 2*self.cov_matrix[np.ix_(free, fixed)] @ w[fixed]
+        factor, _ = cholesky(hessian)
+        m_a = self._cho_solve(factor, constraints.T)
+        m_h = self._cho_solve(factor, linear)
+        rhs = target - self.constraints[:,fixed] @ w[fixed] + constraints @ m_h
+        multipliers = np.linalg.lstsq(constraints @ m_a, rhs, rcond=None)[0]
+        w[free] = m_a @ multipliers - m_h
+        gradient = 2*self.cov_matrix @ w - self.constraints.T @ multipliers
+        return w, gradient
+
+    def _start(self, mu):
+        # a feasible point: on the segment between the two ends of the
+        # frontier. Names on the same bound at both ends start fixed there
+        (low, lowest), (high, highest) = self.ends
+        a = 0.0 if high == low else (mu-low)/(high-low)
+        w = (1-a)*lowest + a*highest
+        at_lower = (lowest == self.lower) & (highest == self.lower)
+        at_upper = (lowest == self.upper) & (highest == self.upper) & ~at_lower
+        w[at_lower] = self.lower[at_lower]
+        w[at_upper] = self.upper[at_upper]
+        return w, at_lower, at_upper
+
+    def portfolio(self, mu, warm=None):
+        # returns (w, state); pass state back as warm for the next mu
+        low, high = self.bounds()
+        if not low <= mu <= high:
+            raise ValueError(f'return {mu} is outside the reachable [{low}, {high}]')
+        if warm is not None:
+            # the previous point and bound set: the first solves reach mu from
+            # there, holding each name that hits a bound on the way
+            try:
+                return self._solve(mu, *warm)
+            except np.linalg.LinAlgError:
+                pass  # too few names left free to reach mu
+        return self._solve(mu, *self._start(mu))
+
+    def _solve(self, mu, w, at_lower, at_upper):
+        target = np.array([mu, 1.0])
+        w, at_lower, at_upper = w.copy(), at_lower.copy(), at_upper.copy()
+        c = self.scale
+        seen = set()
+        for iteration in range(self.max_iter):
+            solved, gradient = self._equality_solve(at_lower, at_upper, target)
+            if np.abs(self.constraints @ solved - target).max() > 1e-9*max(1, abs(mu)):
+                raise np.linalg.LinAlgError('bound set leaves mu out of reach')
+            step = solved - w
+            free = ~(at_lower | at_upper)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                room = np.where(step < 0, (self.lower-w)/step, np.where(step > 0, (self.upper-w)/step, np.inf))
+            room[~free] = np.inf
+            blocking = np.argmin(room)
+            if room[blocking] < 1:
+                # a free name reaches its bound first: stop there and hold it
+                w = w + max(room[blocking], 0)*step
+                if step[blocking] < 0:
+                    at_lower[blocking] = True
+                    w[blocking] = self.lower[blocking]
+                else:
+                    at_upper[blocking] = True
+                    w[blocking] = self.upper[blocking]
+                continue
+            w = solved
+            # the minimum for this bound set; a bound's multiplier is the
+            # gradient there, >= 0 at lower and <= 0 at upper
+            violation = np.where(at_lower, -gradient, 0) + np.where(at_upper, gradient, 0)
+            worst = np.argmax(violation)
+            if violation[worst] <= self.tol*c:
+                self.iterations.append(iteration+1)
+                w = np.clip(w, self.lower, self.upper)
+                return w, (w, at_lower, at_upper)
+            state = at_lower.tobytes() + at_upper.tobytes()
+            if state in seen:
+                break  # cycling, only possible at a degenerate point
+            seen.add(state)
+            at_lower[worst] = at_upper[worst] = False
+        self.iterations.append(iteration+1)
+        w = self._admm(target, np.clip(w, self.lower, self.upper))
+        return w, (w, w <= self.lower, w >= self.upper)
+
+    def _admm(self, target, z):
+        size = self.returns.size
+        rho = 2*self.scale
+        factor, _ = cholesky(2*self.cov_matrix + rho*np.eye(size))
+        m_a = self._cho_solve(factor, self.constraints.T)
+        schur = self.constraints @ m_a
+        u = np.zeros(size)
+        for _ in range(self.admm_iter):
+            v = self._cho_solve(factor, rho*(z-u))
+            w = v - m_a @ np.linalg.solve(schur, self.constraints @ v - target)
+            # over-relaxation, 1.6 as in OSQP
+            relaxed = 1.6*w - 0.6*z
+            z_previous = z
+            z = np.clip(relaxed+u, self.lower, self.upper)
+            u += relaxed - z
+            if np.abs(w-z).max() < 1e-9 and np.abs(z-z_previous).max() < 1e-9:
+                break
+        residual = np.abs(self.constraints @ z - target).max()
+        if residual > 1e-8:
+            raise RuntimeError(f'no feasible portfolio found for return {target[0]:.6g} (residual {residual:.1e})')
+        return z
+
+    def curve(self, points=100):
+        # points that fail are NaN and their returns listed in self.failed
+        low, high = self.bounds()
+        # each end is a single, degenerate portfolio; stay a relative 1e-6 inside
+        margin = 1e-6*(high-low)
+        markowitz_return = np.linspace(low+margin, high-margin, points)
+        markowitz_risk = np.zeros(points)
+        weights = []
+        warm = None
+        for n, mu in enumerate(markowitz_return):
+            try:
+                w, warm = self.portfolio(mu, warm)
+            except (RuntimeError, np.linalg.LinAlgError):
+                self.failed.append(mu)
+                w, warm = np.full(self.returns.size, np.nan), None
+            markowitz_risk[n] = w @ self.cov_matrix @ w
+            weights.append(w)
+        return markowitz_risk, markowitz_return, np.array(weights)
+
+    def tangency(self, risk_free, points=100):
+        # no closed form with bounds: the best k = (mu-risk_free)/risk on the sweep
+        markowitz_risk, markowitz_return, weights = self.curve(points)
+        k = (markowitz_return-risk_free)/markowitz_risk
+        best = np.nanargmax(k)
+        return weights[best], markowitz_risk[best], markowitz_return[best]
@@ -0,0 +1,123 @@
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from .data import Stock, default_backend
+from .store import PriceStore
+import argparse
+import sqlite3
+import zlib
+import time
+import os
+
+# The nightly store refresh as a job that survives crashes: every ticker's
+# outcome is written to a checkpoint as soon as it is known, and a rerun of the
+# same job only does what is left. Shards split the tickers by a stable hash
+# so several processes or machines can fill one shared store; a ticker only
+# ever has one writer, and each shard keeps its own checkpoint file
+#   python -m stock_bot.refresh --shard 0/4 --hours 2
+
+retry = ('throttled',)  # reasons that may go away on the next try, besides exceptions
+
+def shard_of(ticker, count):
+    return zlib.crc32(ticker.encode()) % count
+
+class RefreshJob:
+    def __init__(self, tickers, store, backend=None, job=None, shard=(0, 1), workers=16, max_attempts=3):
+        self.store = store
+        self.backend = backend or default_backend
+        self.job = job or time.strftime('%Y-%m-%d')  # a new day is a new job
+        self.index, self.count = shard
+        self.workers = workers
+        self.max_attempts = max_attempts
+        # the scripts' lists end with '' and may repeat names
+        names = dict.fromkeys(ticker.strip() for ticker in tickers)
+        self.tickers = [ticker for ticker in names if ticker and shard_of(ticker, self.count) == self.index]
+        path = os.path.join(store.path, f'refresh-{self.index}-of-{self.count}.sqlite')
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.execute('create table if not exists status (job text, ticker text, state text, reason text, '
+                        'attempts integer, started real, finished real, primary key (job, ticker))')
+
+    def status(self):
+        # ticker -> (state, reason, attempts, started, finished) for this job
+        rows = self.db.execute('select ticker, state, reason, attempts, started, finished from status where job = ?', (self.job,))
+        return {ticker: tuple(row) for ticker, *row in rows}
+
+    def pending(self):
+        # a ticker left running was cut off by a crash; it gets max_attempts
+        # like a failure, so one that kills the worker isn't retried forever
+        status = self.status()
+        todo = []
+        for ticker in self.tickers:
+            state, _, attempts, _, _ = status.get(ticker, ('new', None, 0, None, None))
+            if state == 'new' or (state in ('running', 'failed') and attempts < self.max_attempts):
+                todo.append(ticker)
+        return todo
+
+    def _mark(self, ticker, state, reason=None, started=None):
+        if state == 'running':
+            self.db.execute('insert into status values (?, ?, ?, null, 1, ?, null) on conflict (job, ticker) '
+                            'do update set state = excluded.state, attempts = attempts+1, started = excluded.started',
+                            (self.job, ticker, state, time.time()))
+        else:
+            self.db.execute('update status set state = ?, reason = ?, finished = ? where job = ? and ticker = ?',
+                            (state, reason, time.time(), self.job, ticker))
+        self.db.commit()
+
+    def _update(self, ticker):
+        try:
+            return Stock(ticker, self.backend, self.store).update()
+        except Exception as e:
+            return f'error: {e!r}'
+
+    def run(self, seconds=None):
+        # refreshes the pending tickers, stopping new work after `seconds`;
+        # returns the counts of this run's outcomes
+        deadline = None if seconds is None else time.monotonic()+seconds
+        for ticker, (state, _, attempts, _, _) in self.status().items():
+            if state == 'running' and attempts >= self.max_attempts:
+                self._mark(ticker, 'failed', 'interrupted')
+        todo = iter(self.pending())
+        counts = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            running = {}
+            while True:
+                while len(running) < self.workers and (deadline is None or time.monotonic() < deadline):
+                    ticker = next(todo, None)
+                    if ticker is None:
+                        break
+                    self._mark(ticker, 'running')
+                    running[pool.submit(self._update, ticker)] = ticker
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    ticker = running.pop(future)
+                    reason = future.result()
+                    state = 'done' if reason == 0 else 'failed' if reason in retry or reason.startswith('error') else 'rejected'
+                    self._mark(ticker, state, None if reason == 0 else reason)
+                    counts[state] = counts.get(state, 0)+1
+        return counts
+
+    def progress(self):
+        counts = {'new': 0}
+        status = self.status()
+        for ticker in self.tickers:
+            state = status[ticker][0] if ticker in status else 'new'
+            counts[state] = counts.get(state, 0)+1
+        return counts
+
+def main():
+    from .universe import tickers
+    parser = argparse.ArgumentParser(description='refresh the local price store, resuming an interrupted run')
+    parser.add_argument('--store', default='stocks')
+    parser.add_argument('--shard', default='0/1', help='index/count, e.g. 2/4')
+    parser.add_argument('--job', default=None, help='defaults to today; reruns of a job resume it')
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--hours', type=float, default=None, help='stop starting new tickers after this long')
+    args = parser.parse_args()
+
+    index, count = map(int, args.shard.split('/'))
+    job = RefreshJob(tickers, PriceStore(args.store), job=args.job, shard=(index, count), workers=args.workers)
+    counts = job.run(None if args.hours is None else args.hours*3600)
+    print(counts, job.progress())
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+import numpy as np
+
+class RollingCovariance:
+    # covariance() and correlation() of every pair over the trailing `days`
+    # prices, kept as running sums so a new day is a rank-1 add and a rank-1
+    # remove instead of a rebuild. The window of returns is a ring buffer.
+    # prices is a (T x N) matrix from align.aligned_prices() ending on
+    # last_date, so every ticker's returns are on the same sessions
+    def __init__(self, tickers, prices, last_date, days=180, resync=250):
+        self.tickers = list(tickers)
+        self.days = days
+        self.resync = resync
+        prices = np.asarray(prices, dtype=float)[-days:]
+        if len(prices) < days:
+            raise ValueError(f'need {days} prices, got {len(prices)}')
+        self.window = prices[1:]-prices[:-1]
+        self.head = 0  # row of the oldest return
+        self.last = prices[-1].copy()
+        self.last_date = np.datetime64(last_date, 'D')
+        self.updates = 0
+        self._rebuild()
+
+    def _rebuild(self):
+        self.sums = self.window.sum(axis=0)
+        self.products = self.window.T @ self.window
+        self.updates = 0
+
+    def update(self, closes, date):
+        closes = np.asarray(closes, dtype=float)
+        new = closes - self.last
+        old = self.window[self.head].copy()
+        self.window[self.head] = new
+        self.head = (self.head+1) % len(self.window)
+        self.sums += new - old
+        self.products += np.outer(new, new) - np.outer(old, old)
+        self.last = closes
+        self.last_date = np.datetime64(date, 'D')
+        self.updates += 1
+        if self.updates >= self.resync:
+            # running sums drift; start over from the window now and then
+            self._rebuild()
+
+    def refresh(self, store):
+        # applies every session newer than last_date that any ticker has in the
+        # store. Like aligned_prices(), a ticker without a close that day (a
+        # holiday on its exchange) repeats its last one
+        fresh = []
+        for ticker in self.tickers:
+            dates = store.dates(ticker, self.days)
+            keep = dates > self.last_date
+            fresh.append(dict(zip(dates[keep].tolist(), store.closes(ticker, self.days)[keep])))
+        sessions = sorted(set().union(*fresh))
+        closes = self.last.copy()
+        for date in sessions:
+            for column, f in enumerate(fresh):
+                closes[column] = f.get(date, closes[column])
+            self.update(closes.copy(), date)
+        return len(sessions)
+
+    def cov_matrix(self):
+        m = len(self.window)
+        return (self.products - np.outer(self.sums, self.sums)/m)/m
+
+    def corr_matrix(self):
+        n = self.days
+        spread = n*np.diag(self.products) - self.sums**2
+        return (n*self.products - np.outer(self.sums, self.sums))/np.sqrt(np.outer(spread, spread))
+
+    def save(self, path):
+        np.savez(path, tickers=np.array(self.tickers), days=self.days, resync=self.resync,
+                 window=np.roll(self.window, -self.head, axis=0), last=self.last,
+                 last_date=self.last_date, sums=self.sums, products=self.products, updates=self.updates)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        rolling = cls.__new__(cls)
+        rolling.tickers = data['tickers'].tolist()
+        rolling.days = int(data['days'])
+        rolling.resync = int(data['resync'])
+        rolling.window = data['window']
+        rolling.head = 0
+        rolling.last = data['last']
+        rolling.last_date = data['last_date'][()]
+        rolling.sums = data['sums']
+        rolling.products = data['products']
+        rolling.updates = int(data['updates'])
+        return rolling
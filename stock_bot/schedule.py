@@ -0,0 +1,156 @@
+import threading
+import random
+import time
+
+# Rate limiting and retries between Stock.update() and a backend. Limits belong
+# to a host, not to a wrapper: every Scheduler for 'finance.yahoo.com' in the
+# process shares one token bucket and one concurrency cap, so a loader and
+# an InfoCache refreshing in the background don't add up to a ban
+
+transient_status = {408, 425, 429, 500, 502, 503, 504}
+
+def status_of(exception):
+    # the HTTP status of a requests/yfinance error, or of a FakeBackend one
+    status = getattr(exception, 'status', None)
+    if status is None:
+        status = getattr(getattr(exception, 'response', None), 'status_code', None)
+    return status
+
+def transient(exception):
+    # worth retrying: throttling, server errors, timeouts and dropped connections.
+    # Anything else (unknown ticker, no data, a parse error) fails the same way twice
+    status = status_of(exception)
+    if status is not None:
+        return status in transient_status
+    if isinstance(exception, (ConnectionError, TimeoutError)):
+        return True
+    name = type(exception).__name__
+    return 'RateLimit' in name or 'Timeout' in name or 'Connection' in name
+
+class TokenBucket:
+    # `rate` requests per second with bursts of `burst`. The rate adapts:
+    # halved on every throttle down to min_rate, stepped back up by `step` per
+    # success up to max_rate; a rate set outside those bounds is kept as it is
+    def __init__(self, rate=5, burst=10, min_rate=0.2, max_rate=50, step=0.05):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.step = step
+        self.tokens = burst
+        self.stamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _fill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now-self.stamp)*self.rate)
+        self.stamp = now
+
+    def take(self):
+        while True:
+            with self.lock:
+                self._fill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1-self.tokens)/self.rate
+            time.sleep(wait)
+
+    def throttled(self, pause=0):
+        with self.lock:
+            self._fill()
+            self.rate = min(self.rate, max(self.min_rate, self.rate/2))
+            self.tokens = min(self.tokens, 0) - pause*self.rate  # nobody starts before the pause is over
+
+    def succeeded(self):
+        with self.lock:
+            self.rate = max(self.rate, min(self.max_rate, self.rate+self.step))
+
+class Host:
+    def __init__(self, concurrency=8, **bucket):
+        self.bucket = TokenBucket(**bucket)
+        self.concurrency = concurrency
+        self.slots = threading.BoundedSemaphore(concurrency)
+
+    def configure(self, concurrency=None, **bucket):
+        with self.bucket.lock:
+            for name, value in bucket.items():
+                if not hasattr(self.bucket, name):
+                    raise TypeError(f'unknown limit {name!r}')
+                setattr(self.bucket, name, value)
+            self.bucket.tokens = min(self.bucket.tokens, self.bucket.burst)
+        if concurrency is not None and concurrency != self.concurrency:
+            # calls in flight release the semaphore they took
+            self.concurrency = concurrency
+            self.slots = threading.BoundedSemaphore(concurrency)
+
+hosts = {}
+_hosts_lock = threading.Lock()
+
+def host(name, **limits):
+    # the shared limits of a host: created on first use, and any limits given
+    # later replace the current ones for every Scheduler of the host
+    with _hosts_lock:
+        if name not in hosts:
+            hosts[name] = Host(**limits)
+        elif limits:
+            hosts[name].configure(**limits)
+        return hosts[name]
+
+class Scheduler:
+    # a backend wrapper: every call waits for a token and a free slot on the
+    # host, and transient failures are retried with exponential backoff and
+    # full jitter. Permanent failures and the last transient one are raised
+    # for Stock.update() to classify
+    def __init__(self, backend, host_name='finance.yahoo.com', retries=5, base=0.5, cap=30, **limits):
+        self.backend = backend
+        self.host = host(host_name, **limits)
+        self.retries = retries
+        self.base = base
+        self.cap = cap
+        self.lock = threading.Lock()
+        self.stats = {'calls': 0, 'retries': 0, 'throttled': 0, 'transient failures': 0, 'permanent failures': 0}
+
+    def _count(self, name):
+        with self.lock:
+            self.stats[name] += 1
+
+    def _call(self, method, *args):
+        self._count('calls')
+        for attempt in range(self.retries+1):
+            self.host.bucket.take()
+            with self.host.slots:
+                try:
+                    result = getattr(self.backend, method)(*args)
+                except Exception as e:
+                    error = e
+                else:
+                    self.host.bucket.succeeded()
+                    return result
+            if not transient(error):
+                self._count('permanent failures')
+                raise error
+            if attempt == self.retries:
+                self._count('transient failures')
+                raise error
+            if status_of(error) == 429:
+                self._count('throttled')
+                self.host.bucket.throttled(_retry_after(error))
+            self._count('retries')
+            time.sleep(random.uniform(0, min(self.cap, self.base*2**attempt)))
+
+    def info(self, ticker):
+        return self._call('info', ticker)
+
+    def history(self, ticker, period='1y'):
+        return self._call('history', ticker, period)
+
+    def download(self, tickers, period='1y'):
+        return self._call('download', tickers, period)
+
+def _retry_after(exception):
+    headers = getattr(getattr(exception, 'response', None), 'headers', None) or {}
+    try:
+        return float(headers.get('Retry-After', 0))
+    except ValueError:
+        return 0
@@ -0,0 +1,110 @@
+from concurrent.futures import ThreadPoolExecutor
+from .data import Stock, load_stocks, default_backend, days
+from .schedule import transient
+from .batch import download, split
+import numpy as np
+
+# Stock.update() downloads a year of history before its cheap rejections. A
+# Screen applies them first, from what is already local, and only the
+# survivors of a stage reach the next, more expensive one:
+#   blank   the trailing '' of the scripts' ticker lists
+#   store   a fresh close under 5 in the local PriceStore
+#   info    ticker info (an InfoCache answers from disk): missing dividend,
+#           a quoted price under 5, or listed less than `days` sessions ago
+#   history the full Stock.update() for what is left, with the histories
+#           downloaded `batch` tickers per request when the backend can
+# Reasons are the ones Stock.update() gives, so rejected() counts still add up
+
+class Screen:
+    def __init__(self, backend=None, store=None, require_dividend=False, workers=16, max_age=5, batch=100):
+        self.backend = backend or default_backend
+        self.store = store
+        self.require_dividend = require_dividend
+        self.workers = workers
+        self.max_age = max_age  # days a stored close counts as current
+        self.batch = batch
+        self.infos = {}
+        self.dropped = {}
+
+    def blank(self, ticker):
+        return 0 if ticker.strip() else 'no info'
+
+    def stored(self, ticker):
+        if self.store is None or ticker not in self.store:
+            return 0
+        age = (np.datetime64('today', 'D') - self.store.last_date(ticker)).astype(int)
+        if age <= self.max_age and self.store.closes(ticker, 1)[0] < 5:
+            return 'penny stock'
+        return 0
+
+    def info(self, ticker):
+        try:
+            info = self.infos[ticker] = self.backend.info(ticker)
+        except Exception as e:
+            return 'throttled' if transient(e) else 'no info'
+        if self.require_dividend and info.get('dividendYield') is None:
+            return 'no dividend'
+        price = info.get('currentPrice') or info.get('previousClose')
+        if price is not None and price < 5:
+            return 'penny stock'
+        listed = info.get('firstTradeDateEpochUtc')
+        if listed is not None:
+            first = np.datetime64(int(listed), 's').astype('datetime64[D]')
+            if np.busday_count(first, np.datetime64('today', 'D')) < days:
+                return 'not enough data'
+        return 0
+
+    def stages(self):
+        return [('blank', self.blank, False), ('store', self.stored, False), ('info', self.info, True)]
+
+    def __call__(self, tickers):
+        # load_stocks() results for every ticker, in order; screened-out ones
+        # come back as (Stock, reason, 0) without touching the history
+        tickers = list(tickers)
+        reasons = {}
+        survivors = tickers
+        for name, check, concurrent in self.stages():
+            if concurrent:
+                with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                    outcome = list(pool.map(check, survivors))
+            else:
+                outcome = [check(ticker) for ticker in survivors]
+            reasons.update((ticker, reason) for ticker, reason in zip(survivors, outcome) if reason != 0)
+            self.dropped[name] = sum(reason != 0 for reason in outcome)
+            survivors = [ticker for ticker, reason in zip(survivors, outcome) if reason == 0]
+
+        loaded = load_stocks(survivors, self.prefetch(survivors), self.workers, self.require_dividend, self.store)
+        self.dropped['history'] = sum(exception != 0 for _, exception, _ in loaded)
+        loaded = dict(zip(survivors, loaded))
+        return [loaded[ticker] if ticker in loaded else (Stock(ticker, self.backend, self.store), reasons[ticker], 0.0)
+                for ticker in tickers]
+
+    def prefetch(self, tickers):
+        # a backend for Stock.update() that answers with the info the screen
+        # fetched and histories downloaded in batches; what a batch lacks is
+        # still fetched one ticker at a time
+        histories = {}
+        if tickers and self.batch and hasattr(self.backend, 'download'):
+            periods = ['5d', '1mo', '1y']
+            period = max((Stock(ticker, self.backend, self.store).period() for ticker in tickers), key=periods.index)
+            try:
+                histories = split(tickers, *download(tickers, self.backend, self.batch, period))
+            except Exception:
+                pass
+        return _Prefetched(self.backend, self.infos, histories)
+
+class _Prefetched:
+    def __init__(self, backend, infos, histories):
+        self.backend = backend
+        self.infos = infos
+        self.histories = histories
+
+    def info(self, ticker):
+        if ticker in self.infos:
+            return self.infos[ticker]
+        return self.backend.info(ticker)
+
+    def history(self, ticker, period='1y'):
+        if ticker in self.histories:
+            return self.histories[ticker]
+        return self.backend.history(ticker, period)
@@ -0,0 +1,79 @@
+import numpy as np
+import os
+
+class PriceStore:
+    # append-only binary price files: stocks/<TICKER>.close holds float64 closes,
+    # stocks/<TICKER>.date the matching int64 day numbers (datetime64[D])
+    def __init__(self, path='stocks'):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, ticker, kind):
+        return os.path.join(self.path, f'{ticker}.{kind}')
+
+    def __contains__(self, ticker):
+        return self.size(ticker) > 0
+
+    def tickers(self):
+        return sorted(name[:-6] for name in os.listdir(self.path) if name.endswith('.close'))
+
+    def size(self, ticker):
+        try:
+            closes = os.path.getsize(self._file(ticker, 'close'))//8
+            dates = os.path.getsize(self._file(ticker, 'date'))//8
+        except OSError:
+            return 0
+        # a crash between the two writes leaves one file longer; ignore the excess
+        return min(closes, dates)
+
+    def last_date(self, ticker):
+        size = self.size(ticker)
+        if size == 0:
+            return None
+        with open(self._file(ticker, 'date'), 'rb') as f:
+            f.seek((size-1)*8)
+            return np.frombuffer(f.read(8), dtype='datetime64[D]')[0]
+
+    def append(self, ticker, dates, closes):
+        dates = np.asarray(dates, dtype='datetime64[D]')
+        closes = np.asarray(closes, dtype=np.float64)
+        last = self.last_date(ticker)
+        if last is not None:
+            keep = dates > last
+            dates = dates[keep]
+            closes = closes[keep]
+        if dates.size == 0:
+            return 0
+        self._truncate(ticker)
+        with open(self._file(ticker, 'close'), 'ab') as f:
+            f.write(closes.tobytes())
+        with open(self._file(ticker, 'date'), 'ab') as f:
+            f.write(dates.tobytes())
+        return dates.size
+
+    def _truncate(self, ticker):
+        size = self.size(ticker)
+        for kind in ('close', 'date'):
+            file = self._file(ticker, kind)
+            if os.path.exists(file) and os.path.getsize(file) != size*8:
+                os.truncate(file, size*8)
+
+    def _view(self, ticker, kind, dtype, n):
+        size = self.size(ticker)
+        if size == 0:
+            return np.empty(0, dtype=dtype)
+        data = np.memmap(self._file(ticker, kind), dtype=dtype, mode='r', shape=(size,))
+        return data if n is None else data[max(size-n, 0):]
+
+    def closes(self, ticker, n=None):
+        return self._view(ticker, 'close', np.float64, n)
+
+    def dates(self, ticker, n=None):
+        return self._view(ticker, 'date', 'datetime64[D]', n)
+
+    def import_txt(self, ticker, file):
+        # migrate a csv written by the older scripts (date,close rows)
+        rows = [line.split(',') for line in open(file) if line.strip()]
+        dates = np.array([row[0][:10] for row in rows], dtype='datetime64[D]')
+        closes = np.array([float(row[1]) for row in rows])
+        return self.append(ticker, dates, closes)
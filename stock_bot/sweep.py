@@ -0,0 +1,181 @@
+from concurrent.futures import ThreadPoolExecutor
+from .pairs import moments, cov_corr_moments
+from .portfolio import Frontier
+from .pipeline import risk_free
+from itertools import product
+import numpy as np
+import argparse
+import heapq
+import json
+import csv
+import os
+
+# The hard-coded knobs of the scripts evaluated as a grid in one pass:
+#   days      price window of the correlation, covariance and z history (180)
+#   window    z_score() window; None is z_score_info()'s expanding window,
+#             which is what the scripts get since max() overrides their 50
+#   min_corr  |corr| > 0.7 in the -07-13 report
+#   min_z     |z| >= 2
+#   horizon   the 14-step cap of z_score_info()
+# Shared work: the return moments of a longer window are a shorter one's
+# plus the extra days, and every (days, window, lag) z-score of a pair is
+# two differences of the same cumulative sums of its price ratio
+#   python -m stock_bot.sweep --days 120 180 250 --out sweep.json
+
+grid = {'days': (120, 180, 250), 'window': (None, 20, 50), 'min_corr': (0.6, 0.7, 0.8),
+        'min_z': (1.5, 2, 2.5), 'horizon': (7, 14, 21)}
+
+def window_cov_corr(prices, days):
+    # {d: cov_corr_aligned(prices[-d:])} for every d in days
+    r = prices[1:]-prices[:-1]
+    total = None
+    done = 0
+    matrices = {}
+    for d in sorted(set(days)):
+        added = moments(r[len(r)-(d-1):len(r)-done])
+        total = added if total is None else [a+b for a, b in zip(total, added)]
+        done = d-1
+        matrices[d] = cov_corr_moments(*total)
+    return matrices
+
+def _lag_z(c1, c2, centered, start, window, lags):
+    # z_score() of the history starting at `start`, cut by 0..lags bars, with
+    # at most `window` prior bars (None: all of them)
+    length = centered.shape[1]
+    t = length-1-np.arange(lags+1)
+    s = np.full_like(t, start) if window is None else np.maximum(t-window, start)
+    k = t-s
+    mean = (c1[:,t] - c1[:,s])/k
+    std = np.sqrt(np.maximum((c2[:,t] - c2[:,s])/k - mean**2, 0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(std == 0, 0, (centered[:,t]-mean)/std)
+
+def _block(rows, prices, corrs, settings, threshold, k):
+    # every setting on the pairs (i, j > i) of a block of rows
+    length, size = prices.shape
+    loosest = min(s['min_corr'] for s in settings)
+    i = np.concatenate([np.full(size-row-1, row) for row in rows])
+    j = np.concatenate([np.arange(row+1, size) for row in rows])
+    keep = np.zeros(len(i), dtype=bool)
+    for _, corr_matrix in corrs.values():
+        keep |= np.abs(corr_matrix[i,j]) > loosest
+    i, j = i[keep], j[keep]
+    results = [[0, 0.0, 0, []] for _ in settings]
+    if len(i) == 0:
+        return results
+
+    ratio = (prices[:,i]/prices[:,j]).T
+    centered = ratio - ratio.mean(axis=1, keepdims=True)
+    c1 = np.zeros((len(i), length+1))
+    c2 = np.zeros_like(c1)
+    np.cumsum(centered, axis=1, out=c1[:,1:])
+    np.cumsum(centered**2, axis=1, out=c2[:,1:])
+    lags = max(s['horizon'] for s in settings)
+
+    cache = {}
+    for result, s in zip(results, settings):
+        days, window, horizon = s['days'], s['window'], s['horizon']
+        if (days, window) not in cache:
+            z = _lag_z(c1, c2, centered, length-days, window, lags)
+            reverted = np.abs(z[:,1:]) <= threshold
+            cache[days, window] = z[:,0], reverted, np.argmax(reverted, axis=1)+1
+        current, reverted, first = cache[days, window]
+
+        # z_score_info() with the cap at `horizon`
+        n = np.where(reverted[:,:horizon].any(axis=1), first, 1)
+        n[np.abs(current) <= threshold] = 1
+        root = np.sqrt(ratio[:,-1]/ratio[np.arange(len(n)), -n])
+        s1_gain = np.where(n == 1, 0, 1/root-1)
+        s2_gain = np.where(n == 1, 0, root-1)
+
+        corr = corrs[days][1][i,j]
+        mask = (np.abs(corr) > s['min_corr']) & (n != 1) & (np.abs(current) >= s['min_z'])
+        mask &= (np.abs(s1_gain) > 0.0001) | (np.abs(s2_gain) > 0.0001)
+        picked = np.flatnonzero(mask)
+        result[0] = len(picked)
+        result[1] = float(np.abs(current[picked]).sum())
+        result[2] = int(n[picked].sum())
+        best = picked[np.argsort(s1_gain[picked], kind='stable')[:k]]
+        result[3] = [(s1_gain[p], i[p], j[p], int(n[p]), s2_gain[p], corr[p], current[p]) for p in best]
+    return results
+
+def sweep_grid(prices, tickers, returns=None, k=10, threshold=0.5, block=16, workers=None, **values):
+    # one row per grid point. prices is an aligned (T x N) matrix with at least
+    # max(days) rows; tickers with gaps in the last max(days) prices are left
+    # out. returns (expected returns per ticker, e.g. dividend yields) adds the
+    # tangency portfolio of each days value. values override grid entries
+    values = {**grid, **values}
+    settings = [dict(zip(values, point)) for point in product(*values.values())]
+    longest = max(values['days'])
+    prices = prices[-longest:]
+    if len(prices) < longest:
+        raise ValueError(f'need {longest} prices, got {len(prices)}')
+    complete = np.flatnonzero(~np.isnan(prices).any(axis=0))
+    prices = np.ascontiguousarray(prices[:,complete])
+    tickers = [tickers[c] for c in complete]
+
+    corrs = window_cov_corr(prices, values['days'])
+    blocks = [range(start, min(start+block, len(tickers)-1)) for start in range(0, len(tickers)-1, block)]
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        parts = list(pool.map(lambda rows: _block(rows, prices, corrs, settings, threshold, k), blocks))
+        portfolios = {}
+        if returns is not None:
+            returns = np.asarray(returns, dtype=float)[complete]
+            portfolios = dict(zip(corrs, pool.map(lambda d: Frontier(corrs[d][0], returns).tangency(risk_free), corrs)))
+
+    table = []
+    for index, s in enumerate(settings):
+        count = sum(part[index][0] for part in parts)
+        best = heapq.nsmallest(k, (pair for part in parts for pair in part[index][3]), key=lambda pair: pair[0])
+        row = {**s, 'pairs': count,
+               'mean |z|': sum(part[index][1] for part in parts)/count if count else 0.0,
+               'mean n': sum(part[index][2] for part in parts)/count if count else 0.0,
+               'top': [(tickers[i], tickers[j], n, float(s1), float(s2), float(corr), float(z))
+                       for s1, i, j, n, s2, corr, z in best]}
+        if s['days'] in portfolios:
+            _, risk, mu = portfolios[s['days']]
+            row.update({'return': float(mu), 'risk': float(risk), 'k': float((mu-risk_free)/risk)})
+        table.append(row)
+    return table
+
+def save(table, path):
+    # .json keeps the top pairs, .csv one line per setting without them
+    if path.endswith('.csv'):
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=[key for key in table[0] if key != 'top'], extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(table)
+    else:
+        with open(path, 'w') as f:
+            json.dump(table, f, indent=1)
+
+def main():
+    from .universe import tickers
+    from .screen import Screen
+    from .batch import download, aligned
+    from .data import accepted
+    parser = argparse.ArgumentParser(description='evaluate a grid of pair and portfolio parameters in one pass')
+    parser.add_argument('--days', type=int, nargs='+', default=grid['days'])
+    parser.add_argument('--window', nargs='+', default=grid['window'], help="z-score windows, 'none' for expanding")
+    parser.add_argument('--min-corr', type=float, nargs='+', default=grid['min_corr'])
+    parser.add_argument('--min-z', type=float, nargs='+', default=grid['min_z'])
+    parser.add_argument('--horizon', type=int, nargs='+', default=grid['horizon'])
+    parser.add_argument('--top', type=int, default=10, help='pairs kept per setting')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--out', default='sweep.json', help='.json or .csv report')
+    args = parser.parse_args()
+
+    windows = [None if str(w).lower() == 'none' else int(w) for w in args.window]
+    # the screened universe, with the longer history the widest window needs
+    stocks = accepted(Screen(require_dividend=True)(tickers))
+    names = [stock.ticker for stock in stocks]
+    _, prices, _ = aligned(names, *download(names, period='2y'), max(args.days))
+    table = sweep_grid(prices, names, [stock.info['dividendYield'] for stock in stocks],
+                  args.top, workers=args.workers, days=args.days, window=windows, min_corr=args.min_corr,
+                  min_z=args.min_z, horizon=args.horizon)
+    save(table, args.out)
+    for row in table:
+        print(' '.join(f'{key}={value:.4g}' if isinstance(value, float) else f'{key}={value}' for key, value in row.items() if key != 'top'))
+
+if __name__ == '__main__':
+    main()
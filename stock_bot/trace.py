@@ -0,0 +1,84 @@
+from contextlib import contextmanager
+import threading
+import json
+import time
+
+class Run:
+    # stage timers and counters for one pipeline run, summarized as a dict.
+    # profile=True runs cProfile over the whole run, memory=True records the
+    # tracemalloc peak of every stage
+    def __init__(self, profile=False, memory=False):
+        self.stages = []
+        self.counters = {}
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.profiler = None
+        self.memory = memory
+        if profile:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        if memory:
+            import tracemalloc
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name):
+        if self.memory:
+            import tracemalloc
+            tracemalloc.reset_peak()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            record = {'stage': name, 'wall': time.perf_counter()-wall, 'cpu': time.process_time()-cpu}
+            if self.memory:
+                record['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+            self.stages.append(record)
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0)+n
+
+    def wrap(self, backend):
+        return _CountingBackend(backend, self)
+
+    def summary(self, top=25):
+        summary = {'started': self.started, 'wall': sum(s['wall'] for s in self.stages),
+                   'stages': self.stages, 'counters': dict(self.counters)}
+        if self.profiler is not None:
+            import pstats
+            self.profiler.disable()
+            stats = pstats.Stats(self.profiler)
+            rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+            summary['profile'] = [{'function': f'{file}:{line}({name})', 'calls': calls, 'cumtime': cumtime}
+                                  for (file, line, name), (_, calls, _, cumtime, _) in rows]
+            self.profiler = None
+        if self.memory:
+            import tracemalloc
+            tracemalloc.stop()
+            self.memory = False
+        return summary
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=1, default=float)
+
+class _CountingBackend:
+    # counts the info/history calls that reach the wrapped backend
+    def __init__(self, backend, run):
+        self.backend = backend
+        self.run = run
+
+    def info(self, ticker):
+        self.run.count('info calls')
+        return self.backend.info(ticker)
+
+    def history(self, ticker, period='1y'):
+        self.run.count('history calls')
+        return self.backend.history(ticker, period)
+
+    def download(self, tickers, period='1y'):
+        self.run.count('download calls')
+        return self.backend.download(tickers, period)
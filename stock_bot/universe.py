@@ -0,0 +1,72 @@
+# the 1000-name universe used by the 2024-07-25 and 2024-08-10 scripts
+tickers = [
+    'AAPL', 'MSFT', 'NVDA', 'GOOGL', 'AMZN', 'META', 'TSM', 'BRK-B', 'LLY', 'AVGO', 'TSLA', 'NVO', 'JPM', 'WMT',
+    'V', 'XOM', 'UNH', 'ASML', 'MA', 'ORCL', 'PG', 'COST', 'JNJ', 'HD', 'BAC', 'MRK', 'ABBV', 'AMD', 'CVX',
+    'NFLX', 'TM', 'KO', 'ADBE', 'CRM', 'AZN', 'SAP', 'SHEL', 'NVS', 'QCOM', 'PEP', 'TMUS', 'LIN', 'WFC', 'TMO',
+    'FMX', 'AMAT', 'PDD', 'ACN', 'CSCO', 'ARM', 'MCD', 'TXN', 'DHR', 'ABT', 'GE', 'INTU', 'DIS', 'AMGN', 'VZ',
+    'AXP', 'MS', 'IBM', 'PFE', 'CAT', 'PM', 'HSBC', 'ISRG', 'TTE', 'RY', 'GS', 'NOW', 'NEE', 'BX', 'UBER',
+    'CMCSA', 'SPGI', 'BHP', 'MU', 'INTC', 'UL', 'LRCX', 'HON', 'UNP', 'SCHW', 'RTX', 'T', 'BKNG', 'COP', 'ETN',
+    'LOW', 'MUFG', 'SYK', 'TJX', 'SNY', 'VRTX', 'C', 'ELV', 'PGR', 'BLK', 'BUD', 'REGN', 'UPS', 'ADI', 'SONY',
+    'KLAC', 'BSX', 'BA', 'ANET', 'PLD', 'NKE', 'RIO', 'LMT', 'PANW', 'TOELY', 'MMC', 'IBN', 'CB', 'KKR', 'MDT',
+    'DELL', 'DE', 'UBS', 'TD', 'PBR', 'ADP', 'BP', 'AMT', 'ABNB', 'CI', 'SNPS', 'CFRUY', 'CRWD', 'SCCO', 'FI',
+    'MDLZ', 'MELI', 'SO', 'GILD', 'CDNS', 'RELX', 'WM', 'ICE', 'INFY', 'SHOP', 'APH', 'BMY', 'SHECY', 'HCA',
+    'SBUX', 'ZTS', 'MO', 'DUK', 'MCO', 'CL', 'GSK', 'CMG', 'SHW', 'GD', 'TT', 'CNQ', 'RACE', 'CP', 'ENB', 'EQIX',
+    'CNI', 'EQNR', 'TRI', 'GLNCY', 'MCK', 'MBGYY', 'FDX', 'FCX', 'EOG', 'DEO', 'CTAS', 'CVS', 'ITW', 'BTI',
+    'NXPI', 'CME', 'TDG', 'TGT', 'ECL', 'BN', 'MAR', 'APO', 'PH', 'CEG', 'PNC', 'SLB', 'CSX', 'USB', 'BDX',
+    'MSI', 'EMR', 'AON', 'NOC', 'NU', 'EPD', 'MRVL', 'RSG', 'BMO', 'PYPL', 'WELL', 'PLTR', 'BBVA', 'ORLY',
+    'ITUB', 'WDAY', 'SPOT', 'NGG', 'CARR', 'ROP', 'STLA', 'ING', 'AJG', 'MPC', 'APD', 'BNS', 'MMM', 'PSX',
+    'AMX', 'EW', 'SPG', 'ET', 'HLT', 'GM', 'PCAR', 'OXY', 'CRH', 'ADSK', 'NEM', 'COIN', 'TFC', 'F', 'COF',
+    'DLR', 'CPRT', 'PSA', 'SMCI', 'AFL', 'WMB', 'HMC', 'MET', 'IBKR', 'AIG', 'BAESY', 'ROST', 'MCHP', 'MNST',
+    'NSC', 'AZO', 'MFC', 'DHI', 'E', 'VALE', 'SU', 'SRE', 'OKE', 'TTD', 'VLO', 'O', 'TRV', 'AEP', 'TEL', 'KMB',
+    'STZ', 'JCI', 'MRNA', 'PCG', 'TEAM', 'SNOW', 'WCN', 'CM', 'HUM', 'BK', 'HES', 'FTNT', 'DSCSY', 'DXCM',
+    'URI', 'GWW', 'KMI', 'ALC', 'CCI', 'ARES', 'KDP', 'LHX', 'AMP', 'PRU', 'COR', 'DASH', 'CHTR', 'D', 'DDOG',
+    'MPLX', 'TAK', 'SE', 'ALL', 'BCS', 'DKILY', 'PAYX', 'CODYY', 'FIS', 'LEN', 'RCL', 'MPWR', 'SQ', 'ODFL',
+    'LNG', 'IDXX', 'TRP', 'OTIS', 'HLN', 'IQV', 'FERG', 'VRSK', 'AME', 'MSCI', 'IR', 'KHC', 'EA', 'BSBR', 'GLW',
+    'PWR', 'CPNG', 'CMI', 'FICO', 'PEG', 'STM', 'KR', 'A', 'NUE', 'HSY', 'PPERY', 'WDS', 'AEM', 'IMO', 'DOW',
+    'CVE', 'FAST', 'YUM', 'EL', 'FANG', 'ACGL', 'CTVA', 'GEHC', 'LULU', 'NDAQ', 'CNC', 'FLUT', 'HPQ', 'SYY',
+    'NWG', 'GIS', 'EXC', 'VRT', 'EXR', 'CTSH', 'IT', 'BIIB', 'BKR', 'WIT', 'MLM', 'CCEP', 'KVUE', 'DD', 'XYL',
+    'VMC', 'ALNY', 'DB', 'DFS', 'HWM', 'TCOM', 'ON', 'QSR', 'GRMN', 'ADM', 'VST', 'GOLD', 'ED', 'LVS', 'ROK',
+    'EFX', 'LYB', 'ATEYY', 'CSGP', 'PPG', 'VICI', 'VEEV', 'XEL', 'CDW', 'HIG', 'ZS', 'SVNDY', 'BCE', 'GFS',
+    'HAL', 'TRGP', 'FUJIY', 'AVB', 'RMD', 'PINS', 'DG', 'SLF', 'MTD', 'DVN', 'DAL', 'WAB', 'ANSS', 'ORAN',
+    'EIX', 'CBRE', 'TSCO', 'CHT', 'NET', 'IRM', 'RKT', 'ARGX', 'ICLR', 'RYAAY', 'SNAP', 'HEI', 'HPE', 'NTAP',
+    'ASX', 'EBAY', 'APP', 'FRFHF', 'WTW', 'WPM', 'CCL', 'AWK', 'TTWO', 'PUK', 'FTV', 'IX', 'TROW', 'BRO', 'EQR',
+    'FITB', 'CHD', 'MTB', 'WDC', 'TECK', 'WEC', 'OWL', 'FCNCA', 'DOV', 'PHG', 'NVR', 'HUBS', 'IFF', 'RBLX',
+    'CQP', 'FSLR', 'RJF', 'GPN', 'FNV', 'VOD', 'KEYS', 'TER', 'NTR', 'WST', 'ROL', 'BR', 'VLTO', 'MSTR', 'PHM',
+    'GIB', 'CCJ', 'KB', 'DTE', 'ETR', 'DLTR', 'CAH', 'STT', 'EC', 'TU', 'TW', 'FE', 'LI', 'DECK', 'ZBH', 'SBAC',
+    'STX', 'AXON', 'SYM', 'LYV', 'MBLY', 'INVH', 'SMPNY', 'PBA', 'TYL', 'ARE', 'STE', 'ENTG', 'PKX', 'VTR',
+    'PTC', 'PSTG', 'ERIC', 'ES', 'WY', 'PPL', 'UMC', 'CUK', 'BF-B', 'BNTX', 'MKL', 'HUBB', 'CSL', 'STLD', 'BAH',
+    'TSN', 'IOT', 'GDDY', 'WRB', 'LDOS', 'CTRA', 'LII', 'LPLA', 'RCI', 'HOOD', 'FTS', 'WSO', 'SYF', 'AEE',
+    'PFG', 'K', 'APTV', 'TLK', 'CPAY', 'WSM', 'ALGN', 'HDELY', 'CHKP', 'SHG', 'HBAN', 'CNP', 'ULTA', 'MKC',
+    'ERIE', 'CINF', 'BEKE', 'GPC', 'RF', 'ILMN', 'AER', 'BALL', 'TDY', 'ESS', 'BBY', 'WLK', 'MDB', 'CRBG',
+    'MT', 'TPL', 'CMS', 'ATO', 'KOF', 'OMC', 'BAX', 'WBD', 'WAT', 'HOLX', 'CBOE', 'NTRS', 'DKNG', 'NMR', 'EME',
+    'BLDR', 'SWKS', 'BEP', 'VRSN', 'J', 'ZM', 'AVY', 'COO', 'IHG', 'EXPD', 'CFG', 'LH', 'TS', 'MAA', 'EXPE',
+    'ZBRA', 'HRL', 'L', 'MOH', 'JBHT', 'DKS', 'TXT', 'CLX', 'RS', 'DRI', 'DPZ', 'RIVN', 'GMAB', 'NRG', 'EG',
+    'ZTO', 'PKG', 'EQT', 'BGNE', 'LUV', 'EBR', 'NWSA', 'FOXA', 'SUI', 'RPRX', 'FDS', 'BMRN', 'MRO', 'BURL',
+    'BG', 'DGX', 'OKTA', 'BAM', 'WMG', 'GEN', 'TPG', 'RTO', 'SSNC', 'AMH', 'WES', 'H', 'UDR', 'IEX', 'CVNA',
+    'CG', 'MAS', 'TRU', 'MANH', 'OC', 'CE', 'ENPH', 'UAL', 'IP', 'VIV', 'NBIX', 'RYAN', 'BSY', 'AVTR', 'GFI',
+    'UTHR', 'GFL', 'RBA', 'DOC', 'AKAM', 'MGM', 'PODD', 'SRPT', 'NTNX', 'LOGI', 'KEY', 'AMCR', 'SNA', 'RPM',
+    'FNF', 'RGA', 'JHX', 'NTRA', 'TRMB', 'AGR', 'LNT', 'BIP', 'GGG', 'KIM', 'PR', 'EQH', 'CPB', 'RVTY', 'NDSN',
+    'CASY', 'BLD', 'CAG', 'TOST', 'BAP', 'NI', 'MEDP', 'SWK', 'CELH', 'AES', 'VTRS', 'NVT', 'DT', 'THC', 'JBL',
+    'PNR', 'ARCC', 'ELS', 'PAA', 'BOUYY', 'EDU', 'CF', 'ALLY', 'WPC', 'TFII', 'MORN', 'OVV', 'HST', 'GLPI',
+    'CNA', 'MGA', 'AOS', 'USFD', 'EVRG', 'SUZ', 'CNH', 'WMS', 'KMX', 'SNN', 'INSM', 'YUMC', 'INCY', 'BCH',
+    'DVA', 'UHS', 'TOL', 'XPO', 'AU', 'LAMR', 'CLH', 'ESTC', 'RKUNY', 'BEN', 'POOL', 'FLEX', 'AZPN', 'JNPR',
+    'SQM', 'SAIA', 'BJ', 'JKHY', 'TECH', 'SJM', 'VIVHY', 'UWMC', 'REG', 'CPT', 'ACM', 'ONON', 'QRVO', 'UHAL',
+    'CYBR', 'MNDY', 'COHR', 'FMS', 'RNR', 'ZI', 'EMN', 'ELF', 'FTI', 'ZG', 'ALB', 'CHWY', 'RL', 'BXP', 'GWRE',
+    'LKQ', 'ONTO', 'FIX', 'ACI', 'LW', 'WING', 'YPF', 'AEG', 'KGC', 'TXRH', 'LECO', 'DOCU', 'APA', 'IPG', 'EPAM',
+    'NICE', 'CHK', 'ITT', 'REXR', 'WTRG', 'JEF', 'TTEK', 'GME', 'CW', 'CRL', 'TAP', 'WWD', 'SBS', 'CHRD', 'OLED',
+    'ALLE', 'TFX', 'AMKR', 'EWBC', 'AFG', 'CTLT', 'BIRK', 'APG', 'CUBE', 'WPP', 'SCI', 'SKX', 'CHDN', 'FND',
+    'SN', 'CNM', 'JLL', 'CHRW', 'FFIV', 'PAG', 'CX', 'HTHT', 'AR', 'TPR', 'XP', 'NLY', 'HII', 'PFGC', 'WBA',
+    'FTAI', 'CAVA', 'UI', 'MUSA', 'STN', 'TWLO', 'UNM', 'SNX', 'BRKR', 'CACI', 'BPYPP', 'BSAC', 'MMYT', 'LNW',
+    'GMED', 'HLI', 'MKSI', 'WYNN', 'FUTU', 'COKE', 'TTC', 'PCOR', 'ATR', 'KEP', 'RRX', 'ASR', 'DINO', 'DOX',
+    'QGEN', 'WIX', 'PNW', 'WFRD', 'AFRM', 'APPF', 'GPS', 'CART', 'PCVX', 'ANF', 'CCK', 'LEGN', 'FHN', 'MOS',
+    'BWXT', 'RGLD', 'TKO', 'FN', 'PPC', 'GNRC', 'KNSL', 'HESM', 'ROKU', 'FRT', 'SEIC', 'CGNX', 'EGP', 'YMM',
+    'OHI', 'ALV', 'X', 'PAAS', 'PSO', 'EVR', 'DCI', 'KBR', 'NYT', 'COTY', 'ARMK', 'SF', 'CROX', 'AIZ', 'FBIN',
+    'DSGX', 'EHC', 'LNTH', 'BZ', 'TPX', 'ROIV', 'INFA', 'ORI', 'TREX', 'CZR', 'OTEX', 'PSN', 'WCC', 'BIO',
+    'RBC', 'MTCH', 'ITCI', 'ESLT', 'EXAS', 'CR', 'HSIC', 'BBWI', 'PAYC', 'EDR', 'DUOL', 'MTSI', 'ALTR', 'SFM',
+    'MTZ', 'XPEV', 'GPK', 'LSCC', 'CIB', 'GTLB', 'WF', 'PRI', 'SKM', 'RRC', 'PARA', 'PAC', 'GLOB', 'HAS', 'MKTX',
+    'NNN', 'CHE', 'DAY', 'CFLT', 'KNX', 'NCLH', 'IEP', 'FLR', 'GNTX', 'WBS', 'GL', 'ASND', 'FCN', 'AXTA', 'COLD',
+    'VIPS', 'PCTY', 'LBRDA', 'MHK', 'DLB', 'SWN', 'WEX', 'EXP', 'LEVI', 'MTDR', 'SUN', 'ENSG', 'CLF', 'INGR',
+    'MSA', 'DDS', 'AYI', 'CERE', 'BWA', 'TIMB', 'HLNE', 'CBSH', 'BPMC', 'LSXMA', 'NXT', 'SSD', 'HRB', 'AGNC',
+    'AIT', 'TX', 'CMA', 'PHYS', 'OGE', 'TKC', 'WAL', 'AAON', 'ATI', 'BRBR', 'VOYA', 'NOV', 'CRUS', 'WSC', 'SOFI',
+    'AGCO', 'IVZ', 'SPSC', 'PEN', 'FSV', 'UFPI', 'DBX', 'PATH', 'KEX',
+]
@@ -0,0 +1,14 @@
+from stock_bot.backtest import qualifying_pairs
+from stock_bot.pairs import scan_pairs
+from test_pairs import universe
+import numpy as np
+
+def test_qualifying_pairs_match_scan_pairs():
+    tickers, prices = universe(size=40)
+    # a mirror of T0 correlates at -1 with it
+    prices = np.column_stack([prices, 400 - prices[:,0]])
+    tickers.append('M0')
+    pairs = {(tickers[i], tickers[j]) for i, j in qualifying_pairs(prices)}
+    assert ('T0', 'M0') in pairs
+    scanned = scan_pairs(prices, tickers, k=10**6, min_z=0, min_gain=-1)
+    assert {pair[:2] for pair in scanned} <= pairs
@@ -0,0 +1,44 @@
+from stock_bot.batch import FixtureBackend, download, split, to_store, aligned
+from stock_bot.store import PriceStore
+import numpy as np
+import os
+
+# fixtures/download.npz: AAA..EEE over 60 sessions from 2025-01-02; BBB starts
+# at session 20, CCC misses sessions 5, 6 and 30
+fixture = os.path.join(os.path.dirname(__file__), 'fixtures', 'download.npz')
+
+def test_batches_match_one_download():
+    backend = FixtureBackend(fixture)
+    tickers = ['EEE', 'AAA', 'CCC', 'BBB', 'DDD']
+    dates, closes = download(tickers, backend, batch=2)
+    assert backend.requests == 3
+    assert closes.shape == (60, 5)
+    whole = FixtureBackend(fixture)
+    for k, ticker in enumerate(tickers):
+        np.testing.assert_array_equal(closes[:,k], whole.closes[:,whole.columns[ticker]])
+
+def test_split_keeps_only_observed_rows():
+    tickers = ['BBB', 'CCC']
+    histories = split(tickers, *download(tickers, FixtureBackend(fixture), batch=1))
+    assert len(histories['BBB'][0]) == 40
+    assert len(histories['CCC'][0]) == 57
+    assert not np.isnan(histories['CCC'][1]).any()
+
+def test_unknown_ticker_keeps_its_column():
+    tickers = ['AAA', 'NOPE', 'BBB']
+    dates, closes = download(tickers, FixtureBackend(fixture), batch=2)
+    assert np.isnan(closes[:,1]).all()
+    assert 'NOPE' not in split(tickers, dates, closes)
+    _, prices, valid = aligned(tickers, dates, closes, 30)
+    assert prices.shape == (30, 3)
+    assert np.isnan(prices[:,1]).all()
+    backend = FixtureBackend(fixture)
+    np.testing.assert_array_equal(prices[:,2], backend.closes[-30:, backend.columns['BBB']])
+
+def test_to_store(tmp_path):
+    store = PriceStore(str(tmp_path))
+    tickers = ['AAA', 'BBB', 'CCC', 'NOPE']
+    assert to_store(store, tickers, *download(tickers, FixtureBackend(fixture))) == 3
+    assert store.size('BBB') == 40
+    assert store.size('CCC') == 57
+    assert 'NOPE' not in store
@@ -0,0 +1,36 @@
+from stock_bot.metadata import InfoCache
+from stock_bot.data import FakeBackend
+import pytest
+import time
+
+def test_failed_lookups_are_cached(tmp_path):
+    backend = FakeBackend(infos={'AAA': {'marketCap': 1}})
+    cache = InfoCache(backend, str(tmp_path/'info.sqlite'), negative_ttl=60)
+    for _ in range(3):
+        with pytest.raises(KeyError):
+            cache.info('')
+    assert backend.requests == 1
+    assert cache.preload(['', 'AAA']) == ['']
+    assert backend.requests == 2
+    assert cache.info('AAA')['marketCap'] == 1
+
+def test_failures_expire(tmp_path):
+    backend = FakeBackend()
+    cache = InfoCache(backend, str(tmp_path/'info.sqlite'), negative_ttl=0.05)
+    with pytest.raises(KeyError):
+        cache.info('')
+    time.sleep(0.1)
+    with pytest.raises(KeyError):
+        cache.info('')
+    assert backend.requests == 2
+
+def test_throttles_are_not_cached(tmp_path):
+    backend = FakeBackend(throttle=1)
+    cache = InfoCache(backend, str(tmp_path/'info.sqlite'))
+    for _ in range(2):
+        with pytest.raises(IOError):
+            cache.info('AAA')
+    assert backend.requests == 2
+    backend.throttle = 0
+    assert cache.info('AAA')['shortName'] == 'AAA'
+    assert cache.failed('AAA') is None
@@ -0,0 +1,58 @@
+from stock_bot.monitor import PairMonitor, ReplayFeed
+from stock_bot.pairs import z_score
+import numpy as np
+
+def replay(days=40, window=20, seed=2):
+    # four tickers, window+days daily closes and three intraday ticks a day
+    rng = np.random.default_rng(seed)
+    tickers = ['AAA', 'BBB', 'CCC', 'DDD']
+    closes = 100*np.exp(np.cumsum(rng.normal(0, 0.02, (window+days, len(tickers))), axis=0))
+    ticks = []
+    for day in range(days):
+        for hour, k in enumerate(rng.permutation(3*len(tickers)) % len(tickers)):
+            stamp = np.datetime64('2025-03-03T10:00') + np.timedelta64(day, 'D') + np.timedelta64(20*hour, 'm')
+            ticks.append((stamp, tickers[k], closes[window+day, k]*rng.uniform(0.97, 1.03)))
+    return tickers, closes, ticks
+
+def test_ticks_score_like_z_score_and_closing_a_bar_scores_nothing():
+    tickers, closes, ticks = replay()
+    window = 20
+    pairs = [('AAA', 'BBB'), ('AAA', 'CCC'), ('DDD', 'BBB'), ('CCC', 'DDD')]
+    m = PairMonitor(pairs, dict(zip(tickers, closes[:window].T)), window, entry=1)
+    history = [list(closes[:window, k]) for k in range(len(tickers))]
+    live = [h[-1] for h in history]
+    date = None
+    emitted = 0
+    for stamp, ticker, price in ticks:
+        if date is not None and np.datetime64(stamp, 'D') > date:
+            # the bar closes at the last prices seen
+            z, side = m.z.copy(), m.side.copy()
+            assert m.close_bar() is None
+            np.testing.assert_array_equal(m.z, z)
+            np.testing.assert_array_equal(m.side, side)
+            for k in range(len(tickers)):
+                history[k].append(live[k])
+        date = np.datetime64(stamp, 'D')
+        k = tickers.index(ticker)
+        live[k] = price
+        signals = m.tick(ticker, price, stamp)
+        emitted += len(signals)
+        assert all(ticker in (signal.ticker1, signal.ticker2) for signal in signals)
+        for row, (t1, t2) in enumerate(pairs):
+            if ticker in (t1, t2):
+                a, b = tickers.index(t1), tickers.index(t2)
+                expected = z_score(np.array(history[a][-window:]+[live[a]]), np.array(history[b][-window:]+[live[b]]), window)
+                assert abs(m.z[row] - expected) < 1e-9
+    assert emitted > 0
+
+def test_run_only_signals_on_ticks(tmp_path):
+    tickers, closes, ticks = replay()
+    path = tmp_path/'feed.csv'
+    path.write_text('time,ticker,price\n' + ''.join(f'{stamp},{ticker},{float(price)!r}\n' for stamp, ticker, price in ticks))
+    pairs = [('AAA', 'BBB'), ('CCC', 'DDD')]
+    m = PairMonitor(pairs, dict(zip(tickers, closes[:20].T)), 20, entry=1)
+    signals = []
+    m.run(ReplayFeed(str(path)), signals.append)
+    by_stamp = {np.datetime64(stamp): ticker for stamp, ticker, _ in ticks}
+    assert signals
+    assert all(by_stamp[signal.time] in (signal.ticker1, signal.ticker2) for signal in signals)
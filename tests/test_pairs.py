@@ -0,0 +1,68 @@
+from stock_bot.pairs import (scan_pairs, z_info_condensed, cov_corr_aligned, cov_corr_matrices, covariance, correlation,
+                            z_score_info_matrices, z_score_info)
+from stock_bot.parallel import pair_matrices
+import numpy as np
+
+def universe(size=120, length=180, seed=3):
+    # one common factor, so plenty of pairs clear the correlation filter
+    rng = np.random.default_rng(seed)
+    factor = np.cumsum(rng.normal(0, 1, (length, 1)), axis=0)
+    prices = 100 + factor + np.cumsum(rng.normal(0, 0.3, (length, size)), axis=0) + rng.uniform(0, 50, size)
+    return [f'T{i}' for i in range(size)], prices
+
+def test_scan_pairs_matches_the_report_rule():
+    tickers, prices = universe()
+    pairs = scan_pairs(prices, tickers, k=10**6)
+    assert pairs
+    assert all(n != 1 for _, _, n, *_ in pairs)
+
+    z_info = z_info_condensed(prices)
+    _, corr_matrix = cov_corr_aligned(prices)
+    picked = z_info.qualifying(corr_matrix, 0.7)
+    picked = picked[np.abs(z_info.data['z'][picked]) >= 2]
+    picked = picked[np.argsort(z_info.data['s1_gain'][picked], kind='stable')]
+    i, j = z_info.indices()
+    assert [pair[:2] for pair in pairs] == [(tickers[i[p]], tickers[j[p]]) for p in picked]
+
+def test_engines_cut_the_aligned_matrix_to_complete_rows():
+    tickers, prices = universe(size=30, length=200)
+    # a late listing: its first 40 rows are NaN in the aligned matrix
+    prices[:40,5] = np.nan
+    corr_matrix, _, _, z_info = pair_matrices(prices, workers=1)
+    complete = prices[40:]
+    np.testing.assert_allclose(corr_matrix, cov_corr_aligned(complete)[1], atol=1e-12)
+    np.testing.assert_array_equal(z_info.data, z_info_condensed(complete).data)
+    assert scan_pairs(prices, tickers, k=10**6) == scan_pairs(complete, tickers, k=10**6)
+
+def test_cov_corr_matrices_match_the_pair_functions():
+    _, prices = universe(size=12, length=220)
+    # unequal histories: some shorter than the window, some longer
+    lengths = [220, 180, 179, 150, 60, 220, 200, 100, 181, 3, 180, 90]
+    histories = [prices[-length:,k] for k, length in enumerate(lengths)]
+    cov_matrix, corr_matrix = cov_corr_matrices(histories, 180)
+    for i in range(len(histories)):
+        for j in range(len(histories)):
+            assert abs(cov_matrix[i,j] - covariance(histories[i], histories[j], 180)) <= 1e-12*abs(cov_matrix[i,j]) + 1e-15
+            assert abs(corr_matrix[i,j] - correlation(histories[i], histories[j], 180)) <= 1e-12
+
+def test_z_score_info_matrices_match_the_pair_function():
+    _, prices = universe(size=10, length=120, seed=5)
+    # T9 runs away from the others over the last 30 bars, so their z stays
+    # past the threshold longer than the 14-bar horizon
+    prices[-30:,9] *= np.exp(np.linspace(0, 0.6, 30))
+    lengths = [120, 110, 100, 120, 90, 120, 105, 120, 95, 120]
+    histories = [prices[-length:,k] for k, length in enumerate(lengths)]
+    z_matrix, n_matrix, s1_matrix, s2_matrix = z_score_info_matrices(histories)
+    common = [h[-min(lengths):] for h in histories]
+    stuck = reverting = 0
+    for i in range(len(histories)):
+        for j in range(i+1, len(histories)):
+            current, n, s1_gain, s2_gain = z_score_info(common[i], common[j], 50)
+            assert n_matrix[i,j] == n_matrix[j,i] == n
+            assert abs(z_matrix[i,j] - current) <= 1e-9*abs(current) + 1e-12
+            assert z_matrix[j,i] == -z_matrix[i,j]
+            assert abs(s1_matrix[i,j] - s1_gain) <= 1e-12 and abs(s2_matrix[i,j] - s2_gain) <= 1e-12
+            assert s1_matrix[j,i] == s2_matrix[i,j] and s2_matrix[j,i] == s1_matrix[i,j]
+            stuck += n == 1 and abs(current) > 0.5
+            reverting += n > 1
+    assert stuck and reverting
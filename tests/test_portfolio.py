@@ -0,0 +1,76 @@
+from stock_bot.portfolio import ConstrainedFrontier, Frontier, BlockSolver
+from stock_bot.estimators import FactorModel
+from stock_bot.pipeline import _tangency
+from stock_bot.trace import Run
+from types import SimpleNamespace
+import numpy as np
+import pytest
+
+def problem(size=200, length=250, seed=4):
+    rng = np.random.default_rng(seed)
+    r = rng.normal(0, 0.01, (length, 3)) @ rng.normal(0, 1, (3, size)) + rng.normal(0, 0.01, (length, size))
+    return r, np.cov(r.T), rng.uniform(0, 0.08, size)
+
+@pytest.mark.parametrize('upper', [1.0, 0.05, 0.02])
+@pytest.mark.parametrize('size, length', [(200, 250), (400, 179)])
+def test_every_point_is_feasible(upper, size, length):
+    # 400 names over 179 returns: a singular sample covariance
+    _, cov_matrix, returns = problem(size, length)
+    frontier = ConstrainedFrontier(cov_matrix, returns, 0.0, upper)
+    assert frontier.regularized == (size > length)
+    _, markowitz_return, weights = frontier.curve(100)
+    assert not frontier.failed
+    np.testing.assert_allclose(weights.sum(axis=1), 1, atol=1e-10)
+    np.testing.assert_allclose(weights @ returns, markowitz_return, atol=1e-10)
+    assert weights.min() >= 0 and weights.max() <= upper
+    # warm starts: most points reuse the previous bound set
+    assert np.median(frontier.iterations) < 20
+
+def test_matches_a_general_solver():
+    from scipy.optimize import minimize
+    _, cov_matrix, returns = problem(size=40)
+    frontier = ConstrainedFrontier(cov_matrix, returns, 0.0, 0.1)
+    low, high = frontier.bounds()
+    for mu in np.linspace(low, high, 7)[1:-1]:
+        w, _ = frontier.portfolio(mu)
+        reference = minimize(lambda x: x @ cov_matrix @ x, np.full(40, 1/40), jac=lambda x: 2*cov_matrix @ x,
+                             bounds=[(0, 0.1)]*40, method='SLSQP', options={'ftol': 1e-15, 'maxiter': 1000},
+                             constraints=[{'type': 'eq', 'fun': lambda x: frontier.constraints @ x - [mu, 1]}]).x
+        assert w @ cov_matrix @ w <= reference @ cov_matrix @ reference + 1e-12
+
+def test_unreachable_return():
+    _, cov_matrix, returns = problem(size=40)
+    frontier = ConstrainedFrontier(cov_matrix, returns, 0.0, 0.1)
+    with pytest.raises(ValueError):
+        frontier.portfolio(frontier.bounds()[1]*1.01)
+
+def test_factor_model_with_bounds():
+    r, _, returns = problem(size=60)
+    stocks = [SimpleNamespace(ticker=f'T{i}') for i in range(60)]
+    results = [(stock, 0, 0.0) for stock in stocks]
+    run = Run()
+    _, portfolio, risk, mu, *_ = _tangency(stocks, results, returns, FactorModel(r, 3), run, (0, 0.05))
+    assert abs(portfolio.sum()-1) < 1e-10 and portfolio.max() <= 0.05
+    assert abs(portfolio @ returns - mu) < 1e-10
+
+def test_block_solver_matches_the_dense_solve():
+    r, cov_matrix, returns = problem(size=300, length=500)
+    solver = BlockSolver(cov_matrix, blocks=64)
+    frontier = Frontier(solver, returns)
+    assert not frontier.regularized
+    np.testing.assert_allclose(frontier.x_r, Frontier(cov_matrix, returns).x_r, rtol=1e-7)
+
+def test_block_solver_floors_a_singular_covariance():
+    # 400 names, 179 returns: CG on C itself breaks down
+    _, cov_matrix, returns = problem(size=400, length=179)
+    frontier = Frontier(BlockSolver(cov_matrix), returns)
+    dense = Frontier(cov_matrix, returns)
+    assert frontier.regularized and dense.regularized
+    w, risk, _ = frontier.tangency(0.045)
+    assert not np.isnan(w).any() and abs(w.sum()-1) < 1e-8
+    assert abs(risk/dense.tangency(0.045)[1] - 1) < 1e-6
+
+def test_block_solver_raises_when_it_does_not_converge():
+    _, cov_matrix, returns = problem(size=200, length=100)
+    with pytest.raises(RuntimeError):
+        BlockSolver(cov_matrix, max_iter=3).solve(returns)
@@ -0,0 +1,39 @@
+from stock_bot.refresh import RefreshJob
+from stock_bot.store import PriceStore
+from stock_bot.data import FakeBackend
+
+tickers = [f'T{i:02d}' for i in range(60)] + ['T00', '']
+
+def test_a_stopped_job_resumes_without_redoing_work(tmp_path):
+    store = PriceStore(str(tmp_path))
+    backend = FakeBackend(latency=0.01)
+    shards = [RefreshJob(tickers, store, backend, 'night', (index, 2), workers=4) for index in range(2)]
+    assert not set(shards[0].tickers) & set(shards[1].tickers)
+    assert sorted(shards[0].tickers + shards[1].tickers) == sorted(set(tickers) - {''})
+
+    job = shards[0]
+    job.run(seconds=0.05)
+    first = job.progress()
+    assert 0 < first.get('done', 0) < len(job.tickers)
+    # a crash leaves a ticker running; a new process picks the job up
+    crashed = job.pending()[0]
+    job._mark(crashed, 'running')
+    requests = backend.requests
+    resumed = RefreshJob(tickers, store, backend, 'night', (0, 2), workers=4)
+    resumed.run()
+    assert resumed.progress() == {'new': 0, 'done': len(job.tickers)}
+    # Stock.update() asks for info and history once per ticker
+    assert backend.requests - requests == 2*(len(job.tickers) - first['done'])
+    assert all(store.size(ticker) == 252 for ticker in job.tickers)
+    assert not any(ticker in store for ticker in shards[1].tickers)
+
+def test_a_ticker_that_kills_the_worker_is_given_up(tmp_path):
+    store = PriceStore(str(tmp_path))
+    job = RefreshJob(tickers[:10], store, FakeBackend(), 'night', max_attempts=2)
+    for _ in range(2):
+        job._mark('T03', 'running')
+    assert 'T03' not in job.pending()
+    job.run()
+    assert job.status()['T03'][:3] == ('failed', 'interrupted', 2)
+    assert 'T03' not in store
+    assert job.progress() == {'new': 0, 'done': 9, 'failed': 1}
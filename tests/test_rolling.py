@@ -0,0 +1,56 @@
+from stock_bot.rolling import RollingCovariance
+from stock_bot.store import PriceStore
+from stock_bot.pipeline import refresh_tangency
+from stock_bot.data import FakeBackend
+import numpy as np
+
+def walks(size=6, length=200, seed=1):
+    rng = np.random.default_rng(seed)
+    dates = np.busday_offset('2025-01-02', np.arange(length), roll='forward')
+    closes = 100*np.exp(np.cumsum(rng.normal(0, 0.02, (length, size)), axis=0))
+    return [f'T{i}' for i in range(size)], dates, closes
+
+def test_saved_state_rolled_one_day_matches_a_rebuild(tmp_path):
+    tickers, dates, closes = walks()
+    store = PriceStore(str(tmp_path/'prices'))
+    for k, ticker in enumerate(tickers):
+        store.append(ticker, dates[:-1], closes[:-1,k])
+    state = str(tmp_path/'prices'/'covariance.npz')
+    RollingCovariance(tickers, closes[:-1], dates[-2]).save(state)
+
+    for k, ticker in enumerate(tickers):
+        store.append(ticker, dates[-1:], closes[-1:,k])
+    rolling = RollingCovariance.load(state)
+    assert rolling.refresh(store) == 1
+    assert rolling.last_date == dates[-1]
+    rebuilt = RollingCovariance(tickers, closes, dates[-1])
+    np.testing.assert_allclose(rolling.cov_matrix(), rebuilt.cov_matrix(), rtol=1e-10, atol=1e-16)
+    np.testing.assert_allclose(rolling.corr_matrix(), rebuilt.corr_matrix(), rtol=1e-10)
+    np.testing.assert_allclose(rolling.cov_matrix(), np.cov(np.diff(closes[-180:], axis=0).T, bias=True), rtol=1e-10)
+
+def test_refresh_tangency_keeps_its_state_with_the_store(tmp_path):
+    store = PriceStore(str(tmp_path/'prices'))
+    tickers = [f'T{i}' for i in range(8)]
+    refresh_tangency(tickers, store, backend=FakeBackend())
+    assert (tmp_path/'prices'/'covariance.npz').exists()
+
+def test_mixed_calendars_roll_like_aligned_prices(tmp_path):
+    from stock_bot.align import aligned_prices
+    tickers, dates, closes = walks(length=220)
+    # T1 closes for a few holidays, T2 trades one extra session
+    holidays = np.zeros(len(dates), dtype=bool)
+    holidays[[50, 190, 205, 206, 219]] = True
+    series = [(dates, closes[:,k]) for k in range(len(tickers))]
+    series[1] = (dates[~holidays], closes[~holidays,1])
+    series[2] = (np.append(dates, dates[-1]+1), np.append(closes[:,2], 101.0))
+    store = PriceStore(str(tmp_path))
+    cut = lambda d, c, end: (d[d <= end], c[d <= end])
+    index, prices, _ = aligned_prices([cut(*s, dates[200]) for s in series], 180)
+    rolling = RollingCovariance(tickers, prices, index[-1])
+    for ticker, (d, c) in zip(tickers, series):
+        store.append(ticker, d, c)
+    assert rolling.refresh(store) == 20
+    index, prices, _ = aligned_prices(series, 180)
+    rebuilt = RollingCovariance(tickers, prices, index[-1])
+    assert rolling.last_date == rebuilt.last_date
+    np.testing.assert_allclose(rolling.cov_matrix(), rebuilt.cov_matrix(), rtol=1e-9, atol=1e-16)
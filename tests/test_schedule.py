@@ -0,0 +1,42 @@
+from stock_bot.data import FakeBackend, HTTPError, load_stocks, rejected, accepted
+from stock_bot.schedule import Scheduler, transient
+from stock_bot.universe import tickers
+
+def test_transient():
+    assert transient(HTTPError(429))
+    assert transient(HTTPError(503))
+    assert transient(TimeoutError())
+    assert not transient(HTTPError(404))
+    assert not transient(KeyError('NOPE'))
+
+def test_later_limits_apply():
+    Scheduler(FakeBackend(), 'test-limits')
+    scheduler = Scheduler(FakeBackend(), 'test-limits', rate=50, burst=50, concurrency=2)
+    assert (scheduler.host.bucket.rate, scheduler.host.bucket.burst, scheduler.host.concurrency) == (50, 50, 2)
+
+def test_stays_under_a_server_limit():
+    names = tickers[:150]
+    unlimited = FakeBackend(limit=200, latency=0.002)
+    assert rejected(load_stocks(names, unlimited, workers=16)).get('throttled', 0) > 0
+
+    backend = FakeBackend(limit=200, latency=0.002)
+    scheduler = Scheduler(backend, 'test-server-limit', rate=100, burst=5, concurrency=8)
+    results = load_stocks(names, scheduler, workers=16)
+    assert len(accepted(results)) + rejected(results).get('penny stock', 0) == len(names)
+    assert backend.refused == 0
+
+def test_retries_random_throttles():
+    backend = FakeBackend(throttle=0.2, latency=0.001)
+    scheduler = Scheduler(backend, 'test-throttle', retries=8, base=0.001, rate=1000, burst=100, min_rate=500)
+    results = load_stocks(tickers[:100], scheduler, workers=16)
+    assert 'throttled' not in rejected(results)
+    assert backend.refused > 0
+    assert scheduler.stats['throttled'] == backend.refused
+
+def test_permanent_failures_are_not_retried():
+    backend = FakeBackend()
+    scheduler = Scheduler(backend, 'test-permanent', base=0.001)
+    results = load_stocks([''], scheduler)
+    assert rejected(results) == {'no info': 1}
+    assert backend.requests == 1
+    assert scheduler.stats['permanent failures'] == 1
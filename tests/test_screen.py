@@ -0,0 +1,34 @@
+from stock_bot.screen import Screen
+from stock_bot.store import PriceStore
+from stock_bot.data import FakeBackend
+from stock_bot.pipeline import tangency
+import numpy as np
+import time
+
+tickers = ['G0', '', 'PEN', 'G1', 'NODIV', 'NEW', 'SHORT', 'G2']
+
+def backend():
+    dates = np.busday_offset('2024-01-02', np.arange(50), roll='forward')
+    return FakeBackend(histories={'SHORT': (dates, np.linspace(20, 30, 50))},
+                       infos={'NODIV': {'marketCap': 10**9, 'currentPrice': 50.0},
+                              'NEW': {'dividendYield': 0.02, 'currentPrice': 50.0,
+                                      'firstTradeDateEpochUtc': int(time.time()) - 30*24*60*60},
+                              'SHORT': {'dividendYield': 0.01, 'currentPrice': 25.0}})
+
+def test_each_stage_drops_what_it_claims_in_input_order(tmp_path):
+    store = PriceStore(str(tmp_path))
+    store.append('PEN', [np.datetime64('today', 'D')], [3.0])
+    screen = Screen(backend(), store, require_dividend=True, workers=4)
+    results = screen(tickers)
+    assert [stock.ticker for stock, _, _ in results] == tickers
+    assert [reason for _, reason, _ in results] == [0, 'no info', 'penny stock', 0, 'no dividend',
+                                                    'not enough data', 'not enough data', 0]
+    assert screen.dropped == {'blank': 1, 'store': 1, 'info': 2, 'history': 1}
+    # the cheap stages kept the backend from being asked
+    assert set(screen.infos) == {'G0', 'G1', 'NODIV', 'NEW', 'SHORT', 'G2'}
+
+def test_explicit_returns_follow_their_tickers():
+    returns = np.arange(len(tickers), dtype=float)
+    names, *_, kept, _ = tangency(tickers, returns, backend(), workers=4)
+    assert list(kept) == [tickers.index(name) for name in names]
+    assert 'SHORT' not in names and '' not in names
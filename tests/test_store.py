@@ -0,0 +1,49 @@
+from stock_bot.store import PriceStore
+import numpy as np
+import os
+
+dates = np.busday_offset('2025-01-02', np.arange(10), roll='forward')
+closes = np.arange(10, 20, dtype=float)
+
+def test_closes_and_dates_tails(tmp_path):
+    store = PriceStore(str(tmp_path))
+    store.append('AAA', dates, closes)
+    assert store.closes('AAA', 0).size == 0
+    np.testing.assert_array_equal(store.closes('AAA', 3), closes[-3:])
+    np.testing.assert_array_equal(store.dates('AAA', 30), dates)
+    np.testing.assert_array_equal(store.closes('AAA'), closes)
+    assert store.closes('NOPE', 5).size == 0
+
+def test_append_keeps_only_newer_dates(tmp_path):
+    store = PriceStore(str(tmp_path))
+    assert store.append('AAA', dates[:6], closes[:6]) == 6
+    # an overlapping fetch adds only what is past the last stored date
+    assert store.append('AAA', dates[3:], closes[3:]+100) == 4
+    assert store.append('AAA', dates[:5], closes[:5]) == 0
+    np.testing.assert_array_equal(store.closes('AAA'), np.concatenate([closes[:6], closes[6:]+100]))
+    assert store.last_date('AAA') == dates[-1]
+
+def test_append_after_a_crash_between_the_two_writes(tmp_path):
+    store = PriceStore(str(tmp_path))
+    store.append('AAA', dates[:6], closes[:6])
+    # the closes of the next append reached disk, its dates did not
+    with open(os.path.join(str(tmp_path), 'AAA.close'), 'ab') as f:
+        f.write(closes[6:8].tobytes())
+    assert store.size('AAA') == 6
+    assert store.last_date('AAA') == dates[5]
+    np.testing.assert_array_equal(store.closes('AAA', 2), closes[4:6])
+    # the retry truncates the excess before appending, so files stay paired
+    assert store.append('AAA', dates[6:], closes[6:]) == 4
+    assert os.path.getsize(os.path.join(str(tmp_path), 'AAA.close')) == 10*8
+    np.testing.assert_array_equal(store.closes('AAA'), closes)
+    np.testing.assert_array_equal(store.dates('AAA'), dates)
+
+def test_import_txt(tmp_path):
+    path = tmp_path/'AAA.txt'
+    path.write_text(''.join(f'{d} 00:00:00-05:00,{c}\n' for d, c in zip(dates, closes)) + '\n')
+    store = PriceStore(str(tmp_path/'store'))
+    assert store.import_txt('AAA', str(path)) == 10
+    assert store.import_txt('AAA', str(path)) == 0
+    np.testing.assert_array_equal(store.dates('AAA'), dates)
+    np.testing.assert_array_equal(store.closes('AAA'), closes)
+    assert store.tickers() == ['AAA']